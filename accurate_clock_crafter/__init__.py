@@ -1,19 +1,54 @@
-from accurate_clock_crafter.builders.analog_clock_builder import build_analog_pack
-from accurate_clock_crafter.builders.digital_clock_builder import build_digital_pack
+from __future__ import annotations
 
+import importlib
+from typing import TYPE_CHECKING, Any
 
-def build_composite_pack() -> None:
+from accurate_clock_crafter._version import __version__
+
+if TYPE_CHECKING:
+    from accurate_clock_crafter.builders.analog_clock_builder import build_analog_pack
+    from accurate_clock_crafter.builders.digital_clock_builder import build_digital_pack
+    from accurate_clock_crafter.core.build_options import BuildOptions
+
+# Public name -> defining module; resolved on first attribute access so importing the
+# package (or one of its small submodules) does not pull in the builders.
+_LAZY_EXPORTS = {
+    "BuildOptions": "accurate_clock_crafter.core.build_options",
+    "build_analog_pack": "accurate_clock_crafter.builders.analog_clock_builder",
+    "build_digital_pack": "accurate_clock_crafter.builders.digital_clock_builder",
+}
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted({*globals(), *_LAZY_EXPORTS})
+
+
+def build_composite_pack(options: BuildOptions | None = None) -> None:
     from accurate_clock_crafter.main import build_composite_pack as _build_composite_pack
 
-    _build_composite_pack()
+    if options is None:
+        _build_composite_pack()
+    else:
+        _build_composite_pack(options)
 
 
-def run() -> None:
+def run(argv: list[str] | None = None) -> None:
     from accurate_clock_crafter.main import run as _run
 
-    _run()
+    _run(argv)
 
 __all__ = [
+    "__version__",
+    "BuildOptions",
     "build_analog_pack",
     "build_digital_pack",
     "build_composite_pack",
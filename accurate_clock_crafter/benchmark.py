@@ -0,0 +1,345 @@
+from __future__ import annotations
+
+import argparse
+import contextlib
+import dataclasses
+import io
+import json
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from types import ModuleType
+from typing import Callable, Iterator
+
+from accurate_clock_crafter._version import __version__
+from accurate_clock_crafter.core.build_options import BuildOptions
+from accurate_clock_crafter.utils.tracing import log
+
+BENCHMARK_FORMAT_VERSION = 1
+DEFAULT_VARIANT_COUNTS = (4, 25, 100)
+DEFAULT_REPEAT = 3
+DEFAULT_REGRESSION_THRESHOLD = 0.10
+SOURCE_TEMPLATES_DIR = Path("inputs_templates")
+SOURCE_ICON_PATH = Path("icon.png")
+BENCHMARK_OPTIONS = BuildOptions(cache_dir=None, write_variant_packs=False)
+
+
+@dataclass(slots=True)
+class StageTiming:
+    runs: list[float] = field(default_factory=list)
+
+    @property
+    def best(self) -> float:
+        return min(self.runs)
+
+    @property
+    def median(self) -> float:
+        return statistics.median(self.runs)
+
+    def to_json(self) -> dict:
+        return {"best": self.best, "median": self.median, "runs": self.runs}
+
+
+@dataclass(slots=True)
+class SyntheticTemplate:
+    name: str
+    template_dir: Path
+    builder: ModuleType
+
+
+@contextlib.contextmanager
+def _working_directory(path: Path) -> Iterator[None]:
+    previous = Path.cwd()
+    os.chdir(path)
+    try:
+        yield
+    finally:
+        os.chdir(previous)
+
+
+def _link_or_copy(source: str, destination: str) -> None:
+    try:
+        os.link(source, destination)
+    except OSError:
+        shutil.copy2(source, destination)
+
+
+def create_synthetic_workspace(workspace: Path, variant_count: int) -> None:
+    # The first round keeps the real template names; later rounds clone them with a suffix.
+    sources = sorted(path for path in SOURCE_TEMPLATES_DIR.iterdir() if path.is_dir())
+    if not sources:
+        raise FileNotFoundError(f"No templates found in {SOURCE_TEMPLATES_DIR}")
+    templates_dir = workspace / SOURCE_TEMPLATES_DIR
+    templates_dir.mkdir(parents=True)
+    for index in range(variant_count):
+        source = sources[index % len(sources)]
+        round_index = index // len(sources)
+        name = source.name if round_index == 0 else f"{source.name}_{round_index:03d}"
+        shutil.copytree(source, templates_dir / name, copy_function=_link_or_copy)
+    _link_or_copy(str(SOURCE_ICON_PATH.resolve()), str(workspace / SOURCE_ICON_PATH))
+
+
+def _quiet() -> contextlib.AbstractContextManager:
+    # Stages print progress lines; they are swallowed so only the timings are shown.
+    return contextlib.redirect_stdout(io.StringIO())
+
+
+def _builder_modules() -> dict[str, ModuleType]:
+    from accurate_clock_crafter.builders import analog_clock_builder, digital_clock_builder
+
+    return {"analog": analog_clock_builder, "digital": digital_clock_builder}
+
+
+def _load_templates() -> list[SyntheticTemplate]:
+    from accurate_clock_crafter.main import discover_templates
+
+    builders = _builder_modules()
+    with _quiet():
+        discovered = discover_templates()
+    return [
+        SyntheticTemplate(template.name, template.template_dir, builders[template.meta_type])
+        for template in discovered
+        if template.meta_type in builders
+    ]
+
+
+def _timed(run: Callable[[], object]) -> float:
+    with _quiet():
+        start = time.perf_counter()
+        run()
+        return time.perf_counter() - start
+
+
+def _stage_runners(options: BuildOptions, output_root: Path) -> dict[str, Callable[[], float]]:
+    from accurate_clock_crafter.core.model_dispatch import (
+        create_virtual_pack,
+        validate_virtual_pack,
+    )
+    from accurate_clock_crafter.core.time_resolution import load_time_resolution
+    from accurate_clock_crafter.io.assets_loader import load_pack_mcmeta
+    from accurate_clock_crafter.io.pack_writer import write_virtual_pack
+    from accurate_clock_crafter.main import (
+        CompositeBuild,
+        _encode_variant,
+        _write_composite,
+        build_pipeline,
+        buildable_templates,
+        discover_templates,
+    )
+
+    templates = _load_templates()
+    resolutions = {
+        template.name: load_time_resolution(load_pack_mcmeta(template.template_dir))
+        for template in templates
+    }
+
+    def built_packs() -> dict[str, dict]:
+        packs = {}
+        with _quiet():
+            for template in templates:
+                pack = packs[template.name] = create_virtual_pack(template.name)
+                template.builder.build_virtual_pack(pack, options)
+        return packs
+
+    packs = built_packs()
+    # Writes start from an empty directory each run so repeats measure the same work.
+    write_options = dataclasses.replace(options, clean=True)
+
+    def index_textures() -> float:
+        fresh = {template.name: create_virtual_pack(template.name) for template in templates}
+        return _timed(
+            lambda: [
+                template.builder.index_textures(
+                    template.template_dir, fresh[template.name], workers=options.io_workers
+                )
+                for template in templates
+            ]
+        )
+
+    def build_models(builder_name: str) -> Callable[[], float]:
+        selected = [t for t in templates if t.builder.__name__.endswith(builder_name)]
+
+        def run() -> float:
+            fresh = {template.name: create_virtual_pack(template.name) for template in selected}
+            return _timed(
+                lambda: [
+                    template.builder.build_models(
+                        template.template_dir, fresh[template.name], resolutions[template.name]
+                    )
+                    for template in selected
+                ]
+            )
+
+        return run
+
+    def build_item_state() -> float:
+        return _timed(
+            lambda: [
+                template.builder.build_item_state_json(template.name, resolutions[template.name])
+                for template in templates
+            ]
+        )
+
+    def validate() -> float:
+        return _timed(lambda: [validate_virtual_pack(pack) for pack in packs.values()])
+
+    def write() -> float:
+        return _timed(
+            lambda: [
+                write_virtual_pack(pack, str(output_root), write_options)
+                for pack in packs.values()
+            ]
+        )
+
+    def assemble() -> float:
+        # The merge, finish, serialize and write tasks of the pipeline, run back to back
+        # on variants that were already built and encoded.
+        with _quiet():
+            discovered = {template.name: template for template in discover_templates()}
+            generated = [
+                (discovered[name], _encode_variant(pack, options)) for name, pack in packs.items()
+            ]
+
+        def run() -> None:
+            build = CompositeBuild(write_options)
+            for template, variant in generated:
+                build.add(template, variant, written=True)
+            _write_composite(write_options, build.serialize(build.finish()))
+
+        return _timed(run)
+
+    def pipeline() -> float:
+        with _quiet():
+            buildable = buildable_templates(discover_templates())
+        return _timed(
+            lambda: build_pipeline(buildable, write_options).run(
+                cpu_workers=min(options.jobs, len(buildable)), io_workers=options.io_workers
+            )
+        )
+
+    return {
+        "discover_templates": lambda: _timed(discover_templates),
+        "index_textures": index_textures,
+        "build_models.analog": build_models("analog_clock_builder"),
+        "build_models.digital": build_models("digital_clock_builder"),
+        "build_item_state": build_item_state,
+        "validate_virtual_pack": validate,
+        "write_virtual_pack": write,
+        "assemble_composite_pack": assemble,
+        "run_pipeline": pipeline,
+    }
+
+
+def run_benchmarks(
+    variant_counts: tuple[int, ...] = DEFAULT_VARIANT_COUNTS,
+    repeat: int = DEFAULT_REPEAT,
+    options: BuildOptions = BENCHMARK_OPTIONS,
+    stages: tuple[str, ...] | None = None,
+) -> dict:
+    results: dict[str, dict] = {}
+    for variant_count in variant_counts:
+        with tempfile.TemporaryDirectory(prefix="acc_bench_") as tmp:
+            workspace = Path(tmp)
+            create_synthetic_workspace(workspace, variant_count)
+            with _working_directory(workspace):
+                runners = _stage_runners(options, workspace / "outputs")
+                for stage, runner in runners.items():
+                    if stages is not None and stage not in stages:
+                        continue
+                    timing = StageTiming()
+                    for _ in range(repeat):
+                        timing.runs.append(runner())
+                    results[f"{stage}@{variant_count}"] = timing.to_json()
+                    log(
+                        "bench",
+                        f"{stage:<24} {variant_count:>4} variants  "
+                        f"best {timing.best * 1000:9.2f} ms  median {timing.median * 1000:9.2f} ms",
+                    )
+    return {
+        "format": BENCHMARK_FORMAT_VERSION,
+        "version": __version__,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repeat": repeat,
+        "options": {
+            key: value
+            for key, value in dataclasses.asdict(options).items()
+            if isinstance(value, (str, int, float, bool, type(None)))
+        },
+        "results": results,
+    }
+
+
+def compare_results(current: dict, baseline: dict, threshold: float) -> list[str]:
+    regressions: list[str] = []
+    for key, timing in sorted(current["results"].items()):
+        previous = baseline.get("results", {}).get(key)
+        if previous is None:
+            log("compare", f"{key:<32} new")
+            continue
+        ratio = timing["median"] / previous["median"] if previous["median"] else float("inf")
+        flagged = ratio > 1.0 + threshold
+        log(
+            "compare",
+            f"{key:<32} {previous['median'] * 1000:9.2f} ms -> "
+            f"{timing['median'] * 1000:9.2f} ms ({ratio:5.2f}x){'  REGRESSION' if flagged else ''}",
+        )
+        if flagged:
+            regressions.append(key)
+    return regressions
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Time the build stages against synthetic template sets."
+    )
+    parser.add_argument(
+        "--variants",
+        type=int,
+        nargs="+",
+        default=list(DEFAULT_VARIANT_COUNTS),
+        help="numbers of variants to clone from inputs_templates",
+    )
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="runs per stage")
+    parser.add_argument("--stage", action="append", help="only run the named stage(s)")
+    parser.add_argument("--output", type=Path, help="write the results as JSON to this file")
+    parser.add_argument("--baseline", type=Path, help="compare against a stored results file")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_REGRESSION_THRESHOLD,
+        help="median slowdown (as a fraction) reported as a regression",
+    )
+    return parser.parse_args(argv)
+
+
+def run(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+    results = run_benchmarks(
+        tuple(args.variants),
+        args.repeat,
+        stages=tuple(args.stage) if args.stage else None,
+    )
+    if args.output is not None:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+        log("done", f"Benchmark results saved to {args.output}")
+    if args.baseline is not None:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare_results(results, baseline, args.threshold)
+        if regressions:
+            log("error", f"{len(regressions)} stage(s) regressed beyond {args.threshold:.0%}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(run())
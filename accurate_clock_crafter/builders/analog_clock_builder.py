@@ -4,31 +4,54 @@ import copy
 import pathlib
 from typing import Any, Callable
 
+from accurate_clock_crafter.core.build_options import DEFAULT_BUILD_OPTIONS, BuildOptions
 from accurate_clock_crafter.core.model_dispatch import (
+    VirtualPack,
     build_item_state,
+    build_layered_item_state,
     clock_model_name,
-    create_virtual_pack,
     validate_virtual_pack,
 )
 from accurate_clock_crafter.core.pack_metadata import (
     RESOURCE_COMPAT_1_21_6_AND_ABOVE,
     build_pack_meta,
 )
+from accurate_clock_crafter.core.texture_derivation import (
+    derive_textures,
+    load_texture_derivation,
+)
+from accurate_clock_crafter.core.time_resolution import (
+    DEFAULT_TIME_RESOLUTION,
+    TimeResolution,
+    load_time_resolution,
+)
 from accurate_clock_crafter.io.assets_loader import (
     load_json_template,
     load_pack_mcmeta,
     resolve_template_dir,
 )
+from accurate_clock_crafter.io.batch_io import DEFAULT_IO_WORKERS
+from accurate_clock_crafter.io.build_cache import load_or_build_virtual_pack
 from accurate_clock_crafter.io.pack_writer import write_virtual_pack
+from accurate_clock_crafter.io.texture_source import texture_sources
 from accurate_clock_crafter.utils.naming import pack_resource_key
+from accurate_clock_crafter.utils.tracing import log, trace_span
+
+HAND_ELEMENT_NAMES = ("hand_hour", "hand_minute")
+MINUTES_PER_HALF_DAY = 12 * 60
+ANGLE_KEY_DIGITS = 6
 
 
-def index_textures(template_dir: pathlib.Path, pack: dict[str, Any]) -> None:
+def index_textures(
+    template_dir: pathlib.Path, pack: dict[str, Any], workers: int = DEFAULT_IO_WORKERS
+) -> None:
     textures_root = template_dir / "assets/minecraft/textures"
     if not textures_root.exists():
         raise FileNotFoundError(f"Missing textures directory: {textures_root}")
     resource_key = pack_resource_key(pack["name"])
 
+    texture_files: list[pathlib.Path] = []
+    output_rel_paths: list[str] = []
     for texture_file in textures_root.rglob("*"):
         if texture_file.is_file() and texture_file.suffix.lower() == ".png":
             texture_rel_path = texture_file.relative_to(textures_root)
@@ -39,16 +62,19 @@ def index_textures(template_dir: pathlib.Path, pack: dict[str, Any]) -> None:
             else:
                 output_texture_rel_path = texture_rel_path
 
-            with open(texture_file, "rb") as f:
-                pack["textures"][output_texture_rel_path.as_posix()] = f.read()
-    print("[done] Textures indexed.")
+            texture_files.append(texture_file)
+            output_rel_paths.append(output_texture_rel_path.as_posix())
+
+    for rel_path, source in zip(output_rel_paths, texture_sources(texture_files, workers)):
+        pack["textures"][rel_path] = source
+    log("done", "Textures indexed.")
 
 
-def _find_element_by_name(elements: list[dict], name: str) -> dict | None:
+def _index_elements_by_name(elements: list[dict]) -> dict[str, dict]:
+    index: dict[str, dict] = {}
     for element in elements:
-        if element.get("name") == name:
-            return element
-    return None
+        index.setdefault(element.get("name"), element)
+    return index
 
 
 def _split_base_and_relative_angle(angle: float) -> tuple[int, float]:
@@ -90,10 +116,18 @@ def _build_parent_model(base_template: dict, resource_key: str) -> dict:
     return parent_model
 
 
+def _is_night_hour(hour: int) -> bool:
+    return 18 <= hour or hour < 6
+
+
+def _has_bg_night_texture(pack: dict[str, Any]) -> bool:
+    return f"item/clock/{pack_resource_key(pack['name'])}/bg_night.png" in pack["textures"]
+
+
 def _build_textures_override_for_hour(
     hour: int, pack_texture_prefix: str, has_bg_night_texture: bool
 ) -> dict | None:
-    if 18 <= hour or hour < 6:
+    if _is_night_hour(hour):
         override = {"hands": f"{pack_texture_prefix}/hands_night"}
         if has_bg_night_texture:
             night_bg_path = f"{pack_texture_prefix}/bg_night"
@@ -103,57 +137,85 @@ def _build_textures_override_for_hour(
     return None
 
 
-def _update_hand_rotation(
-    elements: list[dict], element_name: str, raw_angle: float, templates_by_direction: dict[int, dict]
-) -> None:
-    element = _find_element_by_name(elements, element_name)
-    if element is None:
-        return
-
-    base_angle, relative_angle = _split_base_and_relative_angle(raw_angle)
-    if base_angle != 0:
-        reference_element = _find_element_by_name(
-            templates_by_direction[base_angle]["elements"], element_name
-        )
-        if reference_element is not None:
-            element.update(copy.deepcopy(reference_element))
-
-    element["rotation"]["axis"] = "z"
-    element["rotation"]["angle"] = relative_angle
+class HandRotationCache:
+    __slots__ = ("_static_elements", "_hand_slots", "_elements_by_direction", "_rotated")
+
+    def __init__(self, templates_by_direction: dict[int, dict]) -> None:
+        base_elements = templates_by_direction[0]["elements"]
+        # Non-hand elements are copied once and shared by every generated model.
+        self._static_elements = [copy.deepcopy(element) for element in base_elements]
+        self._hand_slots: dict[str, int] = {}
+        for index, element in enumerate(base_elements):
+            if element.get("name") in HAND_ELEMENT_NAMES:
+                self._hand_slots.setdefault(element["name"], index)
+        self._elements_by_direction = {
+            base_angle: _index_elements_by_name(template["elements"])
+            for base_angle, template in templates_by_direction.items()
+        }
+        self._rotated: dict[tuple[str, float], dict | None] = {}
+
+    def rotated(self, element_name: str, raw_angle: float) -> dict | None:
+        key = (element_name, round(raw_angle % 360, ANGLE_KEY_DIGITS))
+        if key in self._rotated:
+            return self._rotated[key]
+
+        element = self._elements_by_direction[0].get(element_name)
+        if element is not None:
+            element = copy.deepcopy(element)
+            base_angle, relative_angle = _split_base_and_relative_angle(raw_angle)
+            if base_angle != 0:
+                reference_element = self._elements_by_direction[base_angle].get(element_name)
+                if reference_element is not None:
+                    element.update(copy.deepcopy(reference_element))
+            element["rotation"]["axis"] = "z"
+            element["rotation"]["angle"] = relative_angle
+        self._rotated[key] = element
+        return element
+
+    def elements_with_hands(self, hand_angles: dict[str, float]) -> list[dict]:
+        elements = list(self._static_elements)
+        for element_name, raw_angle in hand_angles.items():
+            slot = self._hand_slots.get(element_name)
+            if slot is not None:
+                elements[slot] = self.rotated(element_name, raw_angle)
+        return elements
 
 
 def _build_single_time_model(
     hour: int,
     minute: int,
     parent_model_path: str,
-    base_template: dict,
-    templates_by_direction: dict[int, dict],
+    hand_rotations: HandRotationCache,
     texture_override: dict | None,
+    resolution: TimeResolution = DEFAULT_TIME_RESOLUTION,
 ) -> dict:
+    hour_angle = -resolution.hour_hand_minutes(hour, minute) * (360 / 12 / 60)
+    minute_angle = -minute * (360 / 60)
     model = {
         "parent": parent_model_path,
-        "elements": copy.deepcopy(base_template["elements"]),
+        "elements": hand_rotations.elements_with_hands(
+            {"hand_hour": hour_angle, "hand_minute": minute_angle}
+        ),
     }
     if texture_override:
         model["textures"] = texture_override
-
-    hour_angle = -(hour * 60 + minute) * (360 / 12 / 60)
-    minute_angle = -minute * (360 / 60)
-    _update_hand_rotation(model["elements"], "hand_hour", hour_angle, templates_by_direction)
-    _update_hand_rotation(model["elements"], "hand_minute", minute_angle, templates_by_direction)
     return model
 
 
-def build_models(template_dir: pathlib.Path, pack: dict[str, Any]) -> None:
+def build_models(
+    template_dir: pathlib.Path,
+    pack: dict[str, Any],
+    resolution: TimeResolution = DEFAULT_TIME_RESOLUTION,
+) -> None:
     template_models_dir = template_dir / "assets/minecraft/models/item/clock"
-    textures_dir = template_dir / "assets/minecraft/textures/item/clock"
-    has_bg_night_texture = (textures_dir / "bg_night.png").is_file()
+    has_bg_night_texture = _has_bg_night_texture(pack)
     resource_key = pack_resource_key(pack["name"])
     output_models_dir = f"item/clock/{resource_key}/"
     pack_texture_prefix = f"item/clock/{resource_key}"
 
     templates_by_direction = _load_rotation_templates(template_models_dir)
     base_template = templates_by_direction[0]
+    hand_rotations = HandRotationCache(templates_by_direction)
 
     parent_model = _build_parent_model(base_template, resource_key)
     parent_model_rel_path = f"{output_models_dir}clock_template.json"
@@ -161,7 +223,7 @@ def build_models(template_dir: pathlib.Path, pack: dict[str, Any]) -> None:
     pack["models"][parent_model_rel_path] = parent_model
 
     for hour in range(24):
-        for minute in range(60):
+        for minute in resolution.minutes():
             texture_override = _build_textures_override_for_hour(
                 hour, pack_texture_prefix, has_bg_night_texture
             )
@@ -170,12 +232,133 @@ def build_models(template_dir: pathlib.Path, pack: dict[str, Any]) -> None:
                 hour=hour,
                 minute=minute,
                 parent_model_path=parent_model_path,
-                base_template=base_template,
-                templates_by_direction=templates_by_direction,
+                hand_rotations=hand_rotations,
                 texture_override=texture_override,
+                resolution=resolution,
             )
 
-    print("[done] All model JSONs built.")
+    log("done", "All model JSONs built.")
+
+
+def _hour_hand_position(
+    hour: int, minute: int, resolution: TimeResolution, hour_hand_positions: int
+) -> int:
+    return resolution.hour_hand_minutes(hour, minute) * hour_hand_positions // MINUTES_PER_HALF_DAY
+
+
+def _night_suffix(night: bool) -> str:
+    return "_night" if night else ""
+
+
+def _build_layer_model(
+    parent_model_path: str, elements: list[dict], texture_override: dict | None
+) -> dict:
+    model = {
+        "parent": parent_model_path,
+        "elements": elements,
+    }
+    if texture_override:
+        model["textures"] = texture_override
+    return model
+
+
+def _build_hand_elements(
+    hand_rotations: HandRotationCache, element_name: str, raw_angle: float
+) -> list[dict]:
+    element = hand_rotations.rotated(element_name, raw_angle)
+    return [] if element is None else [element]
+
+
+def build_layered_models(
+    template_dir: pathlib.Path,
+    pack: dict[str, Any],
+    resolution: TimeResolution = DEFAULT_TIME_RESOLUTION,
+    hour_hand_positions: int = 60,
+) -> None:
+    if not 1 <= hour_hand_positions <= MINUTES_PER_HALF_DAY:
+        raise ValueError(
+            f"hour_hand_positions must be between 1 and {MINUTES_PER_HALF_DAY}, "
+            f"got {hour_hand_positions}"
+        )
+    template_models_dir = template_dir / "assets/minecraft/models/item/clock"
+    has_bg_night_texture = _has_bg_night_texture(pack)
+    resource_key = pack_resource_key(pack["name"])
+    output_models_dir = f"item/clock/{resource_key}/"
+    pack_texture_prefix = f"item/clock/{resource_key}"
+
+    templates_by_direction = _load_rotation_templates(template_models_dir)
+    base_template = templates_by_direction[0]
+    hand_rotations = HandRotationCache(templates_by_direction)
+
+    models = pack["models"]
+    parent_model_path = f"minecraft:{output_models_dir}clock_template"
+    models[f"{output_models_dir}clock_template.json"] = _build_parent_model(
+        base_template, resource_key
+    )
+
+    face_elements = [
+        copy.deepcopy(element)
+        for element in base_template["elements"]
+        if element.get("name") not in HAND_ELEMENT_NAMES
+    ]
+    models[f"{output_models_dir}face.json"] = _build_layer_model(
+        parent_model_path, face_elements, None
+    )
+    if has_bg_night_texture:
+        night_bg_path = f"{pack_texture_prefix}/bg_night"
+        models[f"{output_models_dir}face_night.json"] = _build_layer_model(
+            parent_model_path, face_elements, {"face": night_bg_path, "particle": night_bg_path}
+        )
+
+    hour_positions = sorted(
+        {
+            _hour_hand_position(hour, minute, resolution, hour_hand_positions)
+            for hour in range(12)
+            for minute in resolution.minutes()
+        }
+    )
+    for night in (False, True):
+        suffix = _night_suffix(night)
+        hands_override = {"hands": f"{pack_texture_prefix}/hands_night"} if night else None
+        for minute in resolution.minutes():
+            models[f"{output_models_dir}minute_{minute:02d}{suffix}.json"] = _build_layer_model(
+                parent_model_path,
+                _build_hand_elements(hand_rotations, "hand_minute", -minute * (360 / 60)),
+                hands_override,
+            )
+        for position in hour_positions:
+            models[f"{output_models_dir}hour_{position:03d}{suffix}.json"] = _build_layer_model(
+                parent_model_path,
+                _build_hand_elements(
+                    hand_rotations, "hand_hour", -position * (360 / hour_hand_positions)
+                ),
+                hands_override,
+            )
+
+    log("done", "All layered model JSONs built.")
+
+
+def build_layered_item_state_json(
+    pack_name: str,
+    has_bg_night_texture: bool,
+    resolution: TimeResolution = DEFAULT_TIME_RESOLUTION,
+    hour_hand_positions: int = 60,
+) -> dict:
+    model_prefix = f"item/clock/{pack_resource_key(pack_name)}/"
+
+    def face_model(hour: int, minute: int) -> str:
+        return f"{model_prefix}face{_night_suffix(has_bg_night_texture and _is_night_hour(hour))}"
+
+    def hour_hand_model(hour: int, minute: int) -> str:
+        position = _hour_hand_position(hour, minute, resolution, hour_hand_positions)
+        return f"{model_prefix}hour_{position:03d}{_night_suffix(_is_night_hour(hour))}"
+
+    def minute_hand_model(hour: int, minute: int) -> str:
+        return f"{model_prefix}minute_{minute:02d}{_night_suffix(_is_night_hour(hour))}"
+
+    return build_layered_item_state(
+        [face_model, hour_hand_model, minute_hand_model], resolution.minute_step
+    )
 
 
 def _model_name_for_entry(pack_name: str) -> Callable[[int, int], str]:
@@ -183,14 +366,19 @@ def _model_name_for_entry(pack_name: str) -> Callable[[int, int], str]:
     return lambda hour, minute: clock_model_name(model_path_prefix, hour, minute)
 
 
-def build_item_state_json(pack_name: str) -> dict:
+def build_item_state_json(
+    pack_name: str, resolution: TimeResolution = DEFAULT_TIME_RESOLUTION
+) -> dict:
     return build_item_state(
         model_name_for_entry=_model_name_for_entry(pack_name),
+        step_minutes=resolution.minute_step,
         fallback_mode="same",
     )
 
 
-def build_virtual_pack(pack: dict[str, Any]) -> None:
+def build_virtual_pack(
+    pack: dict[str, Any], options: BuildOptions = DEFAULT_BUILD_OPTIONS
+) -> None:
     template_dir = resolve_template_dir(pack["name"])
     template_meta = load_pack_mcmeta(template_dir)
     description = template_meta.get("pack", {}).get("description", "")
@@ -199,17 +387,44 @@ def build_virtual_pack(pack: dict[str, Any]) -> None:
         "pack": build_pack_meta(description, RESOURCE_COMPAT_1_21_6_AND_ABOVE),
     }
 
-    index_textures(template_dir, pack)
-    build_models(template_dir, pack)
-    pack["items"]["clock.json"] = build_item_state_json(pack["name"])
-    validate_virtual_pack(pack)
-    print("[done] Item state JSON built.")
-
-
-def build_analog_pack(template_name: str) -> None:
-    virtual_pack = create_virtual_pack(template_name)
-    build_virtual_pack(virtual_pack)
-    write_virtual_pack(virtual_pack)
+    resolution = load_time_resolution(template_meta)
+
+    with trace_span("index_textures"):
+        index_textures(template_dir, pack, workers=options.io_workers)
+    derivation = load_texture_derivation(template_meta)
+    if derivation:
+        with trace_span("derive_textures"):
+            texture_prefix = f"item/clock/{pack_resource_key(pack['name'])}/"
+            derived_count = derive_textures(pack["textures"], texture_prefix, derivation)
+        log("done", f"{derived_count} textures derived.")
+    layered = options.analog_layout == "layered"
+    with trace_span("build_models"):
+        if layered:
+            build_layered_models(template_dir, pack, resolution, options.hour_hand_positions)
+        else:
+            build_models(template_dir, pack, resolution)
+    with trace_span("build_item_state"):
+        if layered:
+            pack["items"]["clock.json"] = build_layered_item_state_json(
+                pack["name"],
+                _has_bg_night_texture(pack),
+                resolution,
+                options.hour_hand_positions,
+            )
+        else:
+            pack["items"]["clock.json"] = build_item_state_json(pack["name"], resolution)
+    with trace_span("validate_virtual_pack"):
+        validate_virtual_pack(pack)
+    log("done", "Item state JSON built.")
+
+
+def build_analog_pack(
+    template_name: str, options: BuildOptions = DEFAULT_BUILD_OPTIONS
+) -> VirtualPack:
+    virtual_pack = load_or_build_virtual_pack(template_name, options, build_virtual_pack)
+    if options.write_variant_packs:
+        write_virtual_pack(virtual_pack, options=options)
+    return virtual_pack
 
 
 if __name__ == "__main__":
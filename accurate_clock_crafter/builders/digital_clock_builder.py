@@ -4,38 +4,63 @@ import copy
 import pathlib
 from typing import Any, Callable
 
+from accurate_clock_crafter.core.build_options import DEFAULT_BUILD_OPTIONS, BuildOptions
 from accurate_clock_crafter.core.model_dispatch import (
+    VirtualPack,
     build_item_state,
+    build_layered_item_state,
     clock_model_name,
-    create_virtual_pack,
     validate_virtual_pack,
 )
 from accurate_clock_crafter.core.pack_metadata import (
     RESOURCE_COMPAT_1_21_6_AND_ABOVE,
     build_pack_meta,
 )
+from accurate_clock_crafter.core.texture_derivation import (
+    derive_textures,
+    load_texture_derivation,
+)
+from accurate_clock_crafter.core.time_resolution import (
+    DEFAULT_TIME_RESOLUTION,
+    TimeResolution,
+    load_time_resolution,
+)
 from accurate_clock_crafter.io.assets_loader import (
     load_json_template,
     load_pack_mcmeta,
     resolve_template_dir,
 )
+from accurate_clock_crafter.io.batch_io import DEFAULT_IO_WORKERS
+from accurate_clock_crafter.io.build_cache import load_or_build_virtual_pack
 from accurate_clock_crafter.io.pack_writer import write_virtual_pack
+from accurate_clock_crafter.io.texture_source import texture_sources
 from accurate_clock_crafter.utils.naming import format_time, pack_resource_key
+from accurate_clock_crafter.utils.tracing import log, trace_span
 
+# Template texture key -> texture folder holding that slot's digit images.
+DIGIT_SLOT_TEXTURE_DIRS = {"hour": "h", "min1": "m1", "min0": "m0"}
 
-def index_textures(template_dir: pathlib.Path, pack: dict[str, Any]) -> None:
+
+def index_textures(
+    template_dir: pathlib.Path, pack: dict[str, Any], workers: int = DEFAULT_IO_WORKERS
+) -> None:
     textures_dir = template_dir / "assets/minecraft/textures/item/clock"
     if not textures_dir.exists():
         raise FileNotFoundError(f"Missing textures directory: {textures_dir}")
     resource_key = pack_resource_key(pack["name"])
 
+    texture_files: list[pathlib.Path] = []
+    output_rel_paths: list[str] = []
     for texture_file in textures_dir.rglob("*"):
         if texture_file.is_file() and texture_file.suffix.lower() == ".png":
             texture_rel_path = texture_file.relative_to(textures_dir)
             output_texture_rel_path = pathlib.Path("item/clock") / resource_key / texture_rel_path
-            with open(texture_file, "rb") as f:
-                pack["textures"][output_texture_rel_path.as_posix()] = f.read()
-    print("[done] Textures indexed.")
+            texture_files.append(texture_file)
+            output_rel_paths.append(output_texture_rel_path.as_posix())
+
+    for rel_path, source in zip(output_rel_paths, texture_sources(texture_files, workers)):
+        pack["textures"][rel_path] = source
+    log("done", "Textures indexed.")
 
 
 def _load_digital_template(template_models_dir: pathlib.Path) -> dict:
@@ -66,7 +91,11 @@ def _build_digital_time_model(parent_path: str, resource_key: str, hour: int, mi
     }
 
 
-def build_models(template_dir: pathlib.Path, pack: dict[str, Any]) -> None:
+def build_models(
+    template_dir: pathlib.Path,
+    pack: dict[str, Any],
+    resolution: TimeResolution = DEFAULT_TIME_RESOLUTION,
+) -> None:
     template_models_dir = template_dir / "assets/minecraft/models/item/clock"
     resource_key = pack_resource_key(pack["name"])
     output_models_dir = f"item/clock/{resource_key}/"
@@ -79,13 +108,86 @@ def build_models(template_dir: pathlib.Path, pack: dict[str, Any]) -> None:
     pack["models"][parent_model_rel_path] = parent_model
 
     for hour in range(24):
-        for minute in range(60):
+        for minute in resolution.minutes():
             model_rel_path = f"{output_models_dir}clock_{format_time(hour, minute)}.json"
             pack["models"][model_rel_path] = _build_digital_time_model(
                 parent_model_path, resource_key, hour, minute
             )
 
-    print("[done] All model JSONs built.")
+    log("done", "All model JSONs built.")
+
+
+def _digit_slot_values(hour: int, minute: int) -> dict[str, int]:
+    return {"hour": hour, "min1": minute // 10, "min0": minute % 10}
+
+
+def _element_digit_slot(element: dict) -> str | None:
+    for face in element.get("faces", {}).values():
+        texture_key = face.get("texture", "").lstrip("#")
+        if texture_key in DIGIT_SLOT_TEXTURE_DIRS:
+            return texture_key
+    return None
+
+
+def build_layered_models(
+    template_dir: pathlib.Path,
+    pack: dict[str, Any],
+    resolution: TimeResolution = DEFAULT_TIME_RESOLUTION,
+) -> None:
+    template_models_dir = template_dir / "assets/minecraft/models/item/clock"
+    resource_key = pack_resource_key(pack["name"])
+    output_models_dir = f"item/clock/{resource_key}/"
+
+    json_model_template = _load_digital_template(template_models_dir)
+    models = pack["models"]
+    models[f"{output_models_dir}clock_template.json"] = _build_digital_parent_model(
+        json_model_template, resource_key
+    )
+    parent_model_path = f"minecraft:{output_models_dir}clock_template"
+
+    slot_elements: dict[str | None, list[dict]] = {}
+    for element in json_model_template["elements"]:
+        slot_elements.setdefault(_element_digit_slot(element), []).append(element)
+
+    models[f"{output_models_dir}face.json"] = {
+        "parent": parent_model_path,
+        "elements": slot_elements.get(None, []),
+    }
+
+    slot_values: dict[str, set[int]] = {slot: set() for slot in DIGIT_SLOT_TEXTURE_DIRS}
+    for hour in range(24):
+        for minute in resolution.minutes():
+            for slot, value in _digit_slot_values(hour, minute).items():
+                slot_values[slot].add(value)
+
+    for slot, texture_dir in DIGIT_SLOT_TEXTURE_DIRS.items():
+        for value in sorted(slot_values[slot]):
+            models[f"{output_models_dir}{slot}_{value}.json"] = {
+                "parent": parent_model_path,
+                "elements": slot_elements.get(slot, []),
+                "textures": {slot: f"item/clock/{resource_key}/{texture_dir}/{value}"},
+            }
+
+    log("done", "All digit-layer model JSONs built.")
+
+
+def build_layered_item_state_json(
+    pack_name: str, resolution: TimeResolution = DEFAULT_TIME_RESOLUTION
+) -> dict:
+    model_prefix = f"item/clock/{pack_resource_key(pack_name)}/"
+
+    def face_model(hour: int, minute: int) -> str:
+        return f"{model_prefix}face"
+
+    def slot_model(slot: str) -> Callable[[int, int], str]:
+        return lambda hour, minute: (
+            f"{model_prefix}{slot}_{_digit_slot_values(hour, minute)[slot]}"
+        )
+
+    return build_layered_item_state(
+        [face_model, *(slot_model(slot) for slot in DIGIT_SLOT_TEXTURE_DIRS)],
+        resolution.minute_step,
+    )
 
 
 def _model_name_for_entry(pack_name: str) -> Callable[[int, int], str]:
@@ -93,14 +195,19 @@ def _model_name_for_entry(pack_name: str) -> Callable[[int, int], str]:
     return lambda hour, minute: clock_model_name(model_path_prefix, hour, minute)
 
 
-def build_item_state_json(pack_name: str) -> dict:
+def build_item_state_json(
+    pack_name: str, resolution: TimeResolution = DEFAULT_TIME_RESOLUTION
+) -> dict:
     return build_item_state(
         model_name_for_entry=_model_name_for_entry(pack_name),
+        step_minutes=resolution.minute_step,
         fallback_mode="shuffle",
     )
 
 
-def build_virtual_pack(pack: dict[str, Any]) -> None:
+def build_virtual_pack(
+    pack: dict[str, Any], options: BuildOptions = DEFAULT_BUILD_OPTIONS
+) -> None:
     template_dir = resolve_template_dir(pack["name"])
     template_meta = load_pack_mcmeta(template_dir)
     description = template_meta.get("pack", {}).get("description", "")
@@ -109,17 +216,39 @@ def build_virtual_pack(pack: dict[str, Any]) -> None:
         "pack": build_pack_meta(description, RESOURCE_COMPAT_1_21_6_AND_ABOVE),
     }
 
-    index_textures(template_dir, pack)
-    build_models(template_dir, pack)
-    pack["items"]["clock.json"] = build_item_state_json(pack["name"])
-    validate_virtual_pack(pack)
-    print("[done] Item state JSON built.")
-
-
-def build_digital_pack(template_name: str) -> None:
-    virtual_pack = create_virtual_pack(template_name)
-    build_virtual_pack(virtual_pack)
-    write_virtual_pack(virtual_pack)
+    resolution = load_time_resolution(template_meta)
+
+    with trace_span("index_textures"):
+        index_textures(template_dir, pack, workers=options.io_workers)
+    derivation = load_texture_derivation(template_meta)
+    if derivation:
+        with trace_span("derive_textures"):
+            texture_prefix = f"item/clock/{pack_resource_key(pack['name'])}/"
+            derived_count = derive_textures(pack["textures"], texture_prefix, derivation)
+        log("done", f"{derived_count} textures derived.")
+    layered = options.digital_layout == "layered"
+    with trace_span("build_models"):
+        if layered:
+            build_layered_models(template_dir, pack, resolution)
+        else:
+            build_models(template_dir, pack, resolution)
+    with trace_span("build_item_state"):
+        if layered:
+            pack["items"]["clock.json"] = build_layered_item_state_json(pack["name"], resolution)
+        else:
+            pack["items"]["clock.json"] = build_item_state_json(pack["name"], resolution)
+    with trace_span("validate_virtual_pack"):
+        validate_virtual_pack(pack)
+    log("done", "Item state JSON built.")
+
+
+def build_digital_pack(
+    template_name: str, options: BuildOptions = DEFAULT_BUILD_OPTIONS
+) -> VirtualPack:
+    virtual_pack = load_or_build_virtual_pack(template_name, options, build_virtual_pack)
+    if options.write_variant_packs:
+        write_virtual_pack(virtual_pack, options=options)
+    return virtual_pack
 
 
 if __name__ == "__main__":
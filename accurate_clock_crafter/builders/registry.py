@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import importlib
+from typing import TYPE_CHECKING, Callable, Iterator, Mapping, Union
+
+if TYPE_CHECKING:
+    from importlib.metadata import EntryPoint
+
+    from accurate_clock_crafter.core.build_options import BuildOptions
+    from accurate_clock_crafter.core.model_dispatch import VirtualPack
+
+Builder = Callable[[str, "BuildOptions"], "VirtualPack"]
+BuilderSpec = Union[str, "EntryPoint", Builder]
+
+BUILDER_ENTRY_POINT_GROUP = "accurate_clock_crafter.builders"
+BUILTIN_BUILDERS: dict[str, str] = {
+    "analog": "accurate_clock_crafter.builders.analog_clock_builder:build_analog_pack",
+    "digital": "accurate_clock_crafter.builders.digital_clock_builder:build_digital_pack",
+}
+
+
+def _resolve_builder(spec: BuilderSpec) -> Builder:
+    if isinstance(spec, str):
+        module_name, _, attribute = spec.partition(":")
+        return getattr(importlib.import_module(module_name), attribute)
+    if callable(spec):
+        return spec
+    return spec.load()
+
+
+class BuilderRegistry(Mapping[str, Builder]):
+    # Builder modules are imported on first lookup; plugins are discovered only when a
+    # meta_type is not built in or the whole registry is listed.
+    def __init__(
+        self,
+        builtins: Mapping[str, BuilderSpec],
+        entry_point_group: str | None = BUILDER_ENTRY_POINT_GROUP,
+    ) -> None:
+        self._specs: dict[str, BuilderSpec] = dict(builtins)
+        self._loaded: dict[str, Builder] = {}
+        self._entry_point_group = entry_point_group
+        self._discovered = entry_point_group is None
+
+    def register(self, meta_type: str, spec: BuilderSpec) -> None:
+        self._specs[meta_type] = spec
+        self._loaded.pop(meta_type, None)
+
+    def _discover_entry_points(self) -> None:
+        if self._discovered:
+            return
+        self._discovered = True
+        from importlib.metadata import entry_points
+
+        for entry_point in entry_points(group=self._entry_point_group):
+            self._specs.setdefault(entry_point.name, entry_point)
+
+    def __getitem__(self, meta_type: str) -> Builder:
+        builder = self._loaded.get(meta_type)
+        if builder is not None:
+            return builder
+        if meta_type not in self._specs:
+            self._discover_entry_points()
+        builder = self._loaded[meta_type] = _resolve_builder(self._specs[meta_type])
+        return builder
+
+    def __contains__(self, meta_type: object) -> bool:
+        if meta_type not in self._specs:
+            self._discover_entry_points()
+        return meta_type in self._specs
+
+    def __iter__(self) -> Iterator[str]:
+        self._discover_entry_points()
+        return iter(self._specs)
+
+    def __len__(self) -> int:
+        self._discover_entry_points()
+        return len(self._specs)
+
+
+BUILDER_REGISTRY = BuilderRegistry(BUILTIN_BUILDERS)
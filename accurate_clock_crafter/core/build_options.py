@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Literal
+
+from accurate_clock_crafter.io.batch_io import DEFAULT_IO_WORKERS
+from accurate_clock_crafter.io.json_encoding import PRETTY_JSON_PROFILE, JsonProfile
+
+OutputFormat = Literal["directory", "archive"]
+ModelLayout = Literal["full", "layered"]
+TextureOptimization = Literal["off", "lossless", "palette"]
+DEFAULT_CACHE_DIR = ".build_cache"
+# Options that change the generated VirtualPack; everything else only affects how it is written.
+GENERATION_OPTION_FIELDS: tuple[str, ...] = (
+    "analog_layout",
+    "digital_layout",
+    "hour_hand_positions",
+)
+
+
+@dataclass(frozen=True, slots=True)
+class BuildOptions:
+    output_format: OutputFormat = "directory"
+    compression_workers: int | None = None
+    io_workers: int = DEFAULT_IO_WORKERS
+    clean: bool = False
+    write_variant_packs: bool = True
+    strict_merge: bool = False
+    jobs: int = 1
+    json_profile: JsonProfile = PRETTY_JSON_PROFILE
+    report_json_savings: bool = False
+    cache_dir: str | None = DEFAULT_CACHE_DIR
+    analog_layout: ModelLayout = "full"
+    digital_layout: ModelLayout = "full"
+    hour_hand_positions: int = 60
+    texture_optimization: TextureOptimization = "off"
+    link_textures: bool = False
+    trace_json: str | None = None
+    chrome_trace: str | None = None
+    trace_memory: bool = False
+    report_cost: bool = False
+    budget_path: str | None = None
+    verify_dispatch: bool = False
+    audit_time_curve: bool = False
+    watch: bool = False
+    watch_interval: float = 0.5
+
+
+DEFAULT_BUILD_OPTIONS = BuildOptions()
+
+
+def generation_settings(options: BuildOptions) -> dict[str, object]:
+    return {field: getattr(options, field) for field in GENERATION_OPTION_FIELDS}
@@ -0,0 +1,265 @@
+from __future__ import annotations
+
+from array import array
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from typing import Any, Sequence
+
+from accurate_clock_crafter.core.model_dispatch import RangeTable
+from accurate_clock_crafter.core.time_curve import TICKS_PER_DAY, _numpy, clock_angles
+
+OVERWORLD = "minecraft:overworld"
+CUSTOM_NAME_COMPONENT = "minecraft:custom_name"
+# Codes stored per tick and layer: an index into ResolvedModels.names, or one of these.
+UNRESOLVED = -1
+EMPTY_LAYER = -2
+
+
+@dataclass(frozen=True, slots=True)
+class DispatchContext:
+    custom_name: str | None = None
+    dimension: str = OVERWORLD
+
+
+class ResolvedModels:
+    __slots__ = ("names", "layers")
+
+    def __init__(self, names: list[str], layers: list[Any]) -> None:
+        self.names = names
+        self.layers = layers
+
+    def __len__(self) -> int:
+        return len(self.layers[0]) if self.layers else 0
+
+    def _name(self, code: int) -> str | None:
+        return self.names[code] if code >= 0 else None
+
+    def models_at(self, position: int) -> tuple[str | None, ...]:
+        return tuple(self._name(int(layer[position])) for layer in self.layers)
+
+    def layer_paths(self, layer: int) -> list[str | None]:
+        return [self._name(int(code)) for code in self.layers[layer]]
+
+    def model_paths(self) -> set[str]:
+        codes: set[int] = set()
+        for layer in self.layers:
+            codes.update(int(code) for code in _unique(layer))
+        return {self.names[code] for code in codes if code >= 0}
+
+    def unresolved_positions(self) -> list[int]:
+        positions: set[int] = set()
+        for layer in self.layers:
+            positions.update(i for i, code in enumerate(layer) if code == UNRESOLVED)
+        return sorted(positions)
+
+
+def _unique(values: Any) -> Any:
+    np = _numpy()
+    return np.unique(values) if np is not None else set(values)
+
+
+def _float32(values: Any) -> Any:
+    # The game evaluates properties, scales and thresholds in single precision.
+    np = _numpy()
+    if np is not None:
+        return np.asarray(values, dtype=np.float32)
+    return array("f", values)
+
+
+@dataclass(slots=True)
+class _PreparedTable:
+    thresholds: Any
+    # Row 0 is the range_dispatch fallback; row i + 1 is the i-th entry by threshold.
+    codes: Any
+    nested: list[dict | None] | None
+
+
+@dataclass(slots=True)
+class _Evaluation:
+    ticks: Any
+    context: DispatchContext
+    layers: list[Any] = field(default_factory=list)
+    values: dict[str, Any] = field(default_factory=dict)
+
+
+class ItemModelResolver:
+    # Prepared tables are cached by node identity, so the item state must not be mutated
+    # while the resolver is in use.
+    def __init__(self, item_state: dict) -> None:
+        self.item_state = item_state
+        self.names: list[str] = []
+        self._codes: dict[str, int] = {}
+        self._tables: dict[int, _PreparedTable] = {}
+
+    def _code(self, model_name: str) -> int:
+        code = self._codes.get(model_name)
+        if code is None:
+            code = self._codes[model_name] = len(self.names)
+            self.names.append(model_name)
+        return code
+
+    def resolve(
+        self,
+        ticks: Sequence[float] | None = None,
+        context: DispatchContext = DispatchContext(),
+    ) -> ResolvedModels:
+        if ticks is None:
+            ticks = range(int(TICKS_PER_DAY))
+        np = _numpy()
+        if np is not None:
+            ticks = np.asarray(ticks, dtype=np.float64)
+            positions: Any = np.arange(len(ticks))
+        else:
+            ticks = list(ticks)
+            positions = range(len(ticks))
+        evaluation = _Evaluation(ticks=ticks, context=context)
+        self._evaluate(self.item_state["model"], positions, 0, evaluation)
+        return ResolvedModels(self.names, evaluation.layers)
+
+    def _fill(self, evaluation: _Evaluation, layer: int, positions: Any, codes: Any) -> None:
+        np = _numpy()
+        while len(evaluation.layers) <= layer:
+            size = len(evaluation.ticks)
+            evaluation.layers.append(
+                np.full(size, EMPTY_LAYER, dtype=np.int32)
+                if np is not None
+                else array("i", [EMPTY_LAYER]) * size
+            )
+        target = evaluation.layers[layer]
+        if np is not None:
+            target[positions] = codes
+        elif isinstance(codes, int):
+            for position in positions:
+                target[position] = codes
+        else:
+            for position, code in zip(positions, codes):
+                target[position] = code
+
+    def _evaluate(self, node: dict, positions: Any, layer: int, evaluation: _Evaluation) -> int:
+        node_type = node.get("type")
+        if node_type == "minecraft:model":
+            self._fill(evaluation, layer, positions, self._code(node["model"]))
+            return layer + 1
+        if node_type == "minecraft:composite":
+            for child in node.get("models", []):
+                layer = self._evaluate(child, positions, layer, evaluation)
+            return layer
+        if node_type == "minecraft:select":
+            return self._evaluate_select(node, positions, layer, evaluation)
+        if node_type == "minecraft:range_dispatch":
+            return self._evaluate_range(node, positions, layer, evaluation)
+        raise ValueError(f"Unsupported item model type: {node_type}")
+
+    def _evaluate_select(
+        self, node: dict, positions: Any, layer: int, evaluation: _Evaluation
+    ) -> int:
+        selector = node.get("property")
+        if selector == "minecraft:context_dimension":
+            value = evaluation.context.dimension
+        elif selector == "minecraft:component" and node.get("component") == CUSTOM_NAME_COMPONENT:
+            value = evaluation.context.custom_name
+        else:
+            raise ValueError(f"Unsupported select property: {selector}")
+        for case in node.get("cases", []):
+            when = case.get("when")
+            if value == when or (isinstance(when, list) and value in when):
+                return self._evaluate(case["model"], positions, layer, evaluation)
+        fallback = node.get("fallback")
+        if fallback is None:
+            self._fill(evaluation, layer, positions, UNRESOLVED)
+            return layer + 1
+        return self._evaluate(fallback, positions, layer, evaluation)
+
+    def _property_values(self, node: dict, evaluation: _Evaluation) -> Any:
+        if node.get("property") != "minecraft:time":
+            raise ValueError(f"Unsupported range_dispatch property: {node.get('property')}")
+        source = node.get("source", "daytime")
+        values = evaluation.values.get(source)
+        if values is not None:
+            return values
+        # Wobble only delays the needle, so the settled angle is what each tick resolves to.
+        if source == "daytime":
+            values = _float32(clock_angles(evaluation.ticks))
+        elif source == "random":
+            # Random values have no relation to ticks; the sweep covers [0, 1) uniformly.
+            values = _float32([(tick % TICKS_PER_DAY) / TICKS_PER_DAY for tick in evaluation.ticks])
+        else:
+            raise ValueError(f"Unsupported minecraft:time source: {source}")
+        evaluation.values[source] = values
+        return values
+
+    def _prepare(self, node: dict) -> _PreparedTable:
+        table = self._tables.get(id(node))
+        if table is not None:
+            return table
+        entries = node.get("entries", [])
+        if isinstance(entries, RangeTable):
+            rows = [
+                (threshold, {"type": "minecraft:model", "model": entries.model_at(position)})
+                for position, threshold in enumerate(entries.thresholds)
+            ]
+        else:
+            rows = [(entry["threshold"], entry["model"]) for entry in entries]
+        # The game sorts entries by threshold; sorted() is stable like its comparator.
+        rows.sort(key=lambda row: row[0])
+        thresholds = _float32([threshold for threshold, _ in rows])
+        fallback = node.get("fallback")
+        nodes = [fallback] + [model for _, model in rows]
+        codes = [
+            UNRESOLVED
+            if model is None
+            else self._code(model["model"])
+            if model.get("type") == "minecraft:model"
+            else UNRESOLVED
+            for model in nodes
+        ]
+        nested = [
+            model if model is not None and model.get("type") != "minecraft:model" else None
+            for model in nodes
+        ]
+        np = _numpy()
+        table = self._tables[id(node)] = _PreparedTable(
+            thresholds=thresholds,
+            codes=np.asarray(codes, dtype=np.int32) if np is not None else codes,
+            nested=nested if any(model is not None for model in nested) else None,
+        )
+        return table
+
+    def _evaluate_range(
+        self, node: dict, positions: Any, layer: int, evaluation: _Evaluation
+    ) -> int:
+        table = self._prepare(node)
+        values = self._property_values(node, evaluation)
+        np = _numpy()
+        if np is not None:
+            scaled = values[positions] * np.float32(node.get("scale", 1.0))
+            # Row 0 (the fallback) covers values below the first threshold and NaN.
+            rows = np.searchsorted(table.thresholds, scaled, side="right")
+        else:
+            scaled = _float32(values[position] * node.get("scale", 1.0) for position in positions)
+            rows = [bisect_right(table.thresholds, value) for value in scaled]
+        if table.nested is None:
+            codes = table.codes[rows] if np is not None else [table.codes[row] for row in rows]
+            self._fill(evaluation, layer, positions, codes)
+            return layer + 1
+
+        next_layer = layer + 1
+        for row in sorted({int(row) for row in rows}):
+            if np is not None:
+                selected = positions[rows == row]
+            else:
+                selected = [p for p, r in zip(positions, rows) if r == row]
+            child = table.nested[row]
+            if child is None:
+                self._fill(evaluation, layer, selected, int(table.codes[row]))
+                continue
+            next_layer = max(next_layer, self._evaluate(child, selected, layer, evaluation))
+        return next_layer
+
+
+def resolve_item_models(
+    item_state: dict,
+    ticks: Sequence[float] | None = None,
+    context: DispatchContext = DispatchContext(),
+) -> ResolvedModels:
+    return ItemModelResolver(item_state).resolve(ticks, context)
@@ -1,17 +1,18 @@
 from __future__ import annotations
 
-import copy
 import random
+from array import array
 from typing import Callable, Literal, TypedDict
 
-from accurate_clock_crafter.core.time_curve import generate_accurate_hour_markers
-from accurate_clock_crafter.utils.math_utils import interp
+from accurate_clock_crafter.core.time_curve import table_display_times, threshold_table
+from accurate_clock_crafter.io.texture_source import PackPayload
 from accurate_clock_crafter.utils.naming import format_time
 
 HOURS_PER_DAY = 24
 MINUTES_PER_HOUR = 60
 HALF_DAY_HOURS = 12
 TICKS_PER_DAY = 24000.0
+FALLBACK_SHUFFLE_SEED = 0
 
 
 class RangeModel(TypedDict):
@@ -24,12 +25,94 @@ class RangeEntry(TypedDict):
     threshold: float
 
 
+# range_dispatch entries held as parallel arrays; expanded to JSON entries only when encoded.
+class RangeTable:
+    __slots__ = ("thresholds", "model_indices", "model_names")
+
+    def __init__(self, thresholds: array, model_indices: array, model_names: list[str]) -> None:
+        if len(thresholds) != len(model_indices):
+            raise ValueError("RangeTable thresholds and model indices must have the same length")
+        self.thresholds = thresholds
+        self.model_indices = model_indices
+        self.model_names = model_names
+
+    def __len__(self) -> int:
+        return len(self.thresholds)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, RangeTable):
+            return NotImplemented
+        return (
+            self.thresholds == other.thresholds
+            and self.model_indices == other.model_indices
+            and self.model_names == other.model_names
+        )
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __getstate__(self) -> tuple[array, array, list[str]]:
+        return self.thresholds, self.model_indices, self.model_names
+
+    def __setstate__(self, state: tuple[array, array, list[str]]) -> None:
+        self.thresholds, self.model_indices, self.model_names = state
+
+    def model_at(self, position: int) -> str:
+        return self.model_names[self.model_indices[position]]
+
+    def with_model_indices(self, model_indices: array) -> RangeTable:
+        return RangeTable(self.thresholds, model_indices, self.model_names)
+
+    def to_json(self) -> list[RangeEntry]:
+        names = self.model_names
+        return [
+            create_range_entry(names[index], threshold)
+            for threshold, index in zip(self.thresholds, self.model_indices)
+        ]
+
+
+class RangeTableBuilder:
+    __slots__ = (
+        "_thresholds",
+        "_model_indices",
+        "_model_names",
+        "_index_by_name",
+        "_collapse_runs",
+    )
+
+    def __init__(self, collapse_runs: bool = False) -> None:
+        self._thresholds = array("d")
+        self._model_indices = array("I")
+        self._model_names: list[str] = []
+        self._index_by_name: dict[str, int] = {}
+        # Consecutive rows with the same model select the same thing, so one entry suffices.
+        self._collapse_runs = collapse_runs
+
+    def append(self, model_name: str, threshold: float) -> None:
+        index = self._index_by_name.get(model_name)
+        if (
+            self._collapse_runs
+            and index is not None
+            and self._model_indices
+            and self._model_indices[-1] == index
+        ):
+            return
+        if index is None:
+            index = len(self._model_names)
+            self._index_by_name[model_name] = index
+            self._model_names.append(model_name)
+        self._thresholds.append(threshold)
+        self._model_indices.append(index)
+
+    def build(self) -> RangeTable:
+        return RangeTable(self._thresholds, self._model_indices, self._model_names)
+
+
 class VirtualPack(TypedDict):
     name: str
     pack_mcmeta: dict
     items: dict[str, dict]
     models: dict[str, dict]
-    textures: dict[str, bytes]
+    textures: dict[str, PackPayload]
 
 
 def create_virtual_pack(pack_name: str) -> VirtualPack:
@@ -52,6 +135,23 @@ def create_range_entry(model_name: str, threshold: float) -> RangeEntry:
     }
 
 
+def _build_range_dispatch(source: str, entries: RangeTable | list[RangeEntry]) -> dict:
+    return {
+        "type": "minecraft:range_dispatch",
+        "property": "minecraft:time",
+        "source": source,
+        "scale": TICKS_PER_DAY,
+        "entries": entries,
+    }
+
+
+def _build_composite_dispatch(source: str, tables: list[RangeTable]) -> dict:
+    return {
+        "type": "minecraft:composite",
+        "models": [_build_range_dispatch(source, table) for table in tables],
+    }
+
+
 def _build_item_state_skeleton() -> dict:
     return {
         "model": {
@@ -60,74 +160,71 @@ def _build_item_state_skeleton() -> dict:
             "cases": [
                 {
                     "when": "minecraft:overworld",
-                    "model": {
-                        "type": "minecraft:range_dispatch",
-                        "property": "minecraft:time",
-                        "source": "daytime",
-                        "scale": TICKS_PER_DAY,
-                        "entries": [],
-                    },
+                    "model": _build_range_dispatch("daytime", []),
                 }
             ],
-            "fallback": {
-                "type": "minecraft:range_dispatch",
-                "property": "minecraft:time",
-                "source": "random",
-                "scale": TICKS_PER_DAY,
-                "entries": [],
-            },
+            "fallback": _build_range_dispatch("random", []),
         }
     }
 
 
-def _build_time_entries(model_name_for_entry: Callable[[int, int], str]) -> list[RangeEntry]:
-    accurate_hours = [hour_ratio * TICKS_PER_DAY for hour_ratio in generate_accurate_hour_markers()]
-    entries: list[RangeEntry] = []
-
-    for hour in range(0, HALF_DAY_HOURS):
-        for minute in range(0, MINUTES_PER_HOUR):
-            threshold = interp(
-                accurate_hours[hour], accurate_hours[hour + 1], minute / MINUTES_PER_HOUR
-            )
-            display_hour = hour + HALF_DAY_HOURS
-            model_name = model_name_for_entry(display_hour, minute)
-            entries.append(create_range_entry(model_name, threshold))
-
-    for hour in range(HALF_DAY_HOURS, HOURS_PER_DAY):
-        for minute in range(0, MINUTES_PER_HOUR):
-            threshold = interp(
-                accurate_hours[hour], accurate_hours[hour + 1], minute / MINUTES_PER_HOUR
-            )
-            display_hour = hour - HALF_DAY_HOURS
-            model_name = model_name_for_entry(display_hour, minute)
-            entries.append(create_range_entry(model_name, threshold))
-
-    return entries
+def _build_time_entries(
+    model_name_for_entry: Callable[[int, int], str],
+    step_minutes: int = 1,
+    collapse_runs: bool = False,
+) -> RangeTable:
+    table = RangeTableBuilder(collapse_runs=collapse_runs)
+    rows = zip(threshold_table(step_minutes), table_display_times(step_minutes))
+    for threshold, (hour, minute) in rows:
+        table.append(model_name_for_entry(hour, minute), threshold)
+    return table.build()
 
 
-def _shuffle_fallback_models(entries: list[RangeEntry]) -> None:
-    model_names = [entry["model"]["model"] for entry in entries]
-    random.shuffle(model_names)
-    for entry, model_name in zip(entries, model_names):
-        entry["model"]["model"] = model_name
+def _shuffle_fallback_models(table: RangeTable) -> RangeTable:
+    model_indices = table.model_indices.tolist()
+    random.Random(FALLBACK_SHUFFLE_SEED).shuffle(model_indices)
+    return table.with_model_indices(array(table.model_indices.typecode, model_indices))
 
 
 def build_item_state(
     model_name_for_entry: Callable[[int, int], str],
     fallback_mode: Literal["same", "shuffle"] = "same",
+    step_minutes: int = 1,
 ) -> dict:
     item_state = _build_item_state_skeleton()
-    daytime_entries = _build_time_entries(model_name_for_entry)
-    fallback_entries = copy.deepcopy(daytime_entries)
-
+    daytime_entries = _build_time_entries(model_name_for_entry, step_minutes)
+    # Tables are never mutated after construction, so the fallback can share them.
+    fallback_entries = daytime_entries
     if fallback_mode == "shuffle":
-        _shuffle_fallback_models(fallback_entries)
+        fallback_entries = _shuffle_fallback_models(daytime_entries)
 
     item_state["model"]["cases"][0]["model"]["entries"] = daytime_entries
     item_state["model"]["fallback"]["entries"] = fallback_entries
     return item_state
 
 
+def build_layered_item_state(
+    layer_model_names: list[Callable[[int, int], str]], step_minutes: int = 1
+) -> dict:
+    tables = [
+        _build_time_entries(model_name_for_entry, step_minutes, collapse_runs=True)
+        for model_name_for_entry in layer_model_names
+    ]
+    return {
+        "model": {
+            "type": "minecraft:select",
+            "property": "minecraft:context_dimension",
+            "cases": [
+                {
+                    "when": "minecraft:overworld",
+                    "model": _build_composite_dispatch("daytime", tables),
+                }
+            ],
+            "fallback": _build_composite_dispatch("random", tables),
+        }
+    }
+
+
 def clock_model_name(model_path_prefix: str, hour: int, minute: int) -> str:
     return f"{model_path_prefix}{format_time(hour, minute)}"
 
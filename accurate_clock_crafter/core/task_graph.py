@@ -0,0 +1,196 @@
+from __future__ import annotations
+
+import heapq
+import time
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+from dataclasses import dataclass, field
+from typing import Any, Callable, Literal
+
+from accurate_clock_crafter.utils.tracing import TRACER, TraceEvent, TraceSpan, pool_task
+
+# cpu tasks run in worker processes, io tasks on threads and main tasks on the scheduling
+# thread between completions. Without process workers, cpu tasks run like main tasks.
+TaskKind = Literal["cpu", "io", "main"]
+
+
+@dataclass(frozen=True, slots=True)
+class Task:
+    name: str
+    function: Callable[..., Any]
+    args: tuple = ()
+    # Results of these tasks are appended to args; ordered_after only delays the start.
+    inputs: tuple[str, ...] = ()
+    ordered_after: tuple[str, ...] = ()
+    kind: TaskKind = "main"
+
+    @property
+    def dependencies(self) -> tuple[str, ...]:
+        return (*self.inputs, *self.ordered_after)
+
+
+@dataclass(slots=True)
+class GraphRun:
+    results: dict[str, Any] = field(default_factory=dict)
+    durations: dict[str, float] = field(default_factory=dict)
+    wall: float = 0.0
+
+
+def _call(function: Callable[..., Any], args: tuple) -> tuple[Any, float]:
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+
+def _call_in_worker(
+    function: Callable[..., Any], args: tuple, trace_memory: bool
+) -> tuple[Any, float, tuple[list[TraceSpan], list[TraceEvent]]]:
+    # Workers start from a clean tracer and hand their records back with the result.
+    TRACER.reset(trace_memory)
+    result, duration = _call(function, args)
+    return result, duration, TRACER.records()
+
+
+class TaskGraph:
+    def __init__(self) -> None:
+        self.tasks: dict[str, Task] = {}
+
+    def add(
+        self,
+        name: str,
+        function: Callable[..., Any],
+        *args: Any,
+        after: tuple[str, ...] = (),
+        ordered_after: tuple[str, ...] = (),
+        kind: TaskKind = "main",
+    ) -> str:
+        if name in self.tasks:
+            raise ValueError(f"Task already defined: {name}")
+        self.tasks[name] = Task(name, function, tuple(args), after, ordered_after, kind)
+        return name
+
+    def _topological_order(self) -> list[str]:
+        for task in self.tasks.values():
+            for dependency in task.dependencies:
+                if dependency not in self.tasks:
+                    raise ValueError(f"Task {task.name} depends on unknown task {dependency}")
+        remaining = {name: len(task.dependencies) for name, task in self.tasks.items()}
+        dependents = self._dependents()
+        ready = [name for name, count in remaining.items() if count == 0]
+        order: list[str] = []
+        while ready:
+            name = ready.pop()
+            order.append(name)
+            for dependent in dependents[name]:
+                remaining[dependent] -= 1
+                if remaining[dependent] == 0:
+                    ready.append(dependent)
+        if len(order) != len(self.tasks):
+            cycle = sorted(name for name, count in remaining.items() if count)
+            raise ValueError(f"Task graph has a cycle through: {', '.join(cycle)}")
+        return order
+
+    def _dependents(self) -> dict[str, list[str]]:
+        dependents: dict[str, list[str]] = {name: [] for name in self.tasks}
+        for task in self.tasks.values():
+            for dependency in task.dependencies:
+                dependents[dependency].append(task.name)
+        return dependents
+
+    def run(self, cpu_workers: int = 1, io_workers: int = 1) -> GraphRun:
+        self._topological_order()
+        start = time.perf_counter()
+        run = GraphRun()
+        dependents = self._dependents()
+        waiting = {name: len(task.dependencies) for name, task in self.tasks.items()}
+        # Tasks start in the order they were added, so earlier variants are built first.
+        ready = [name for name, count in waiting.items() if count == 0]
+        pending: dict[Future, str] = {}
+        # Inline tasks run in the order they were added, so with a single process each
+        # variant is merged before the next one is generated.
+        position = {name: index for index, name in enumerate(self.tasks)}
+        inline: list[tuple[int, str]] = []
+        use_processes = cpu_workers > 1 and any(
+            task.kind == "cpu" for task in self.tasks.values()
+        )
+        processes: Executor | None = (
+            ProcessPoolExecutor(max_workers=cpu_workers) if use_processes else None
+        )
+        threads = ThreadPoolExecutor(max_workers=max(io_workers, 1))
+
+        def finish(name: str, result: Any, duration: float) -> None:
+            run.results[name] = result
+            run.durations[name] = duration
+            for dependent in dependents[name]:
+                waiting[dependent] -= 1
+                if waiting[dependent] == 0:
+                    ready.append(dependent)
+
+        try:
+            while inline or ready or pending:
+                for name in ready:
+                    task = self.tasks[name]
+                    args = (*task.args, *(run.results[d] for d in task.inputs))
+                    if task.kind == "cpu" and processes is not None:
+                        future = processes.submit(
+                            _call_in_worker, task.function, args, TRACER.trace_memory
+                        )
+                    elif task.kind == "io":
+                        future = threads.submit(pool_task(_call), task.function, args)
+                    else:
+                        heapq.heappush(inline, (position[name], name))
+                        continue
+                    pending[future] = name
+                ready.clear()
+
+                # One inline task at a time, so the pool work it unblocks is handed out before
+                # the next one starts; pool tasks that finished meanwhile are collected first.
+                done = {future for future in pending if future.done()}
+                if not done and inline:
+                    _, name = heapq.heappop(inline)
+                    task = self.tasks[name]
+                    args = (*task.args, *(run.results[d] for d in task.inputs))
+                    finish(name, *_call(task.function, args))
+                    continue
+                if not done:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = pending.pop(future)
+                    if self.tasks[name].kind == "cpu" and processes is not None:
+                        result, duration, records = future.result()
+                        TRACER.merge(records)
+                    else:
+                        result, duration = future.result()
+                    finish(name, result, duration)
+        finally:
+            for future in pending:
+                future.cancel()
+            threads.shutdown(wait=True)
+            if processes is not None:
+                processes.shutdown(wait=True)
+        run.wall = time.perf_counter() - start
+        return run
+
+    def critical_path(self, durations: dict[str, float]) -> tuple[list[str], float]:
+        finish: dict[str, float] = {}
+        previous: dict[str, str | None] = {}
+        for name in self._topological_order():
+            task = self.tasks[name]
+            before = max(task.dependencies, key=lambda d: finish[d], default=None)
+            finish[name] = (finish[before] if before else 0.0) + durations.get(name, 0.0)
+            previous[name] = before
+        if not finish:
+            return [], 0.0
+        name: str | None = max(finish, key=finish.__getitem__)
+        total = finish[name]
+        path: list[str] = []
+        while name is not None:
+            path.append(name)
+            name = previous[name]
+        return path[::-1], total
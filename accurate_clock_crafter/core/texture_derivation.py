@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+from accurate_clock_crafter.io.texture_source import PackPayload, mapped_payload
+
+if TYPE_CHECKING:
+    from PIL import Image
+
+    from accurate_clock_crafter.utils.image_utils import RGB
+
+NIGHT_SUFFIX = "_night"
+EMISSIVE_SUFFIX = "_e"
+
+
+@dataclass(frozen=True, slots=True)
+class TextureDerivation:
+    night: dict[str, dict[RGB, RGB]] = field(default_factory=dict)
+    emissive: dict[str, tuple[RGB, ...]] = field(default_factory=dict)
+    # Derived textures only replace same-named template textures when this is set.
+    replace_existing: bool = False
+
+    def __bool__(self) -> bool:
+        return bool(self.night or self.emissive)
+
+
+NO_TEXTURE_DERIVATION = TextureDerivation()
+
+
+def _parse_color(value: object) -> RGB:
+    if isinstance(value, str):
+        hex_value = value.removeprefix("#")
+        if len(hex_value) != 6:
+            raise ValueError(f"derived_textures color must be '#rrggbb', got {value!r}")
+        return tuple(int(hex_value[i : i + 2], 16) for i in (0, 2, 4))
+    if isinstance(value, list) and len(value) == 3 and all(isinstance(c, int) for c in value):
+        if not all(0 <= c <= 255 for c in value):
+            raise ValueError(f"derived_textures color channels must be 0-255, got {value!r}")
+        return tuple(value)
+    raise ValueError(f"derived_textures color must be '#rrggbb' or [r, g, b], got {value!r}")
+
+
+def load_texture_derivation(template_meta: dict) -> TextureDerivation:
+    spec = template_meta.get("derived_textures")
+    if spec is None:
+        return NO_TEXTURE_DERIVATION
+    if not isinstance(spec, dict):
+        raise ValueError("pack.mcmeta 'derived_textures' must be an object")
+    night = {
+        name: {_parse_color(source): _parse_color(target) for source, target in pairs}
+        for name, pairs in spec.get("night", {}).items()
+    }
+    emissive = {
+        name: tuple(_parse_color(color) for color in colors)
+        for name, colors in spec.get("emissive", {}).items()
+    }
+    replace_existing = spec.get("replace_existing", False)
+    if not isinstance(replace_existing, bool):
+        raise ValueError("pack.mcmeta 'derived_textures.replace_existing' must be true or false")
+    return TextureDerivation(night=night, emissive=emissive, replace_existing=replace_existing)
+
+
+def _decode_texture(textures: dict[str, PackPayload], rel_path: str) -> Image.Image:
+    payload = textures.get(rel_path)
+    if payload is None:
+        raise FileNotFoundError(f"derived_textures refers to missing texture: {rel_path}")
+    from accurate_clock_crafter.utils.image_utils import decode_png
+
+    with mapped_payload(payload) as data:
+        return decode_png(data)
+
+
+def derive_textures(
+    textures: dict[str, PackPayload], texture_prefix: str, derivation: TextureDerivation
+) -> int:
+    # Pillow is only imported for templates that actually declare derived textures.
+    from accurate_clock_crafter.utils.image_utils import (
+        emissive_layer,
+        encode_png,
+        remap_colors,
+    )
+
+    images: dict[str, Image.Image] = {}
+    emissive_colors = dict(derivation.emissive)
+    # Night variants come first so their emissive layers follow the remapped colors.
+    for name, mapping in derivation.night.items():
+        night_name = f"{name}{NIGHT_SUFFIX}"
+        images[name] = _decode_texture(textures, f"{texture_prefix}{name}.png")
+        images[night_name] = remap_colors(images[name], mapping)
+        if name in emissive_colors and night_name not in emissive_colors:
+            emissive_colors[night_name] = tuple(
+                mapping.get(color, color) for color in emissive_colors[name]
+            )
+
+    derived = {
+        f"{name}{NIGHT_SUFFIX}": encode_png(images[f"{name}{NIGHT_SUFFIX}"])
+        for name in derivation.night
+    }
+    for name, colors in emissive_colors.items():
+        image = images.get(name)
+        if image is None:
+            image = _decode_texture(textures, f"{texture_prefix}{name}.png")
+        derived[f"{name}{EMISSIVE_SUFFIX}"] = encode_png(emissive_layer(image, colors))
+
+    existing = sorted(
+        rel_path
+        for rel_path in (f"{texture_prefix}{name}.png" for name in derived)
+        if rel_path in textures
+    )
+    if existing and not derivation.replace_existing:
+        raise ValueError(
+            f"derived_textures would overwrite {len(existing)} template texture(s), e.g. "
+            f"{existing[0]}; remove them or set \"replace_existing\": true"
+        )
+    for name, payload in derived.items():
+        textures[f"{texture_prefix}{name}.png"] = payload
+    return len(derived)
@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+import hashlib
+import io
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any
+
+from PIL import Image
+
+from accurate_clock_crafter.core.model_dispatch import VirtualPack
+from accurate_clock_crafter.io.batch_io import DEFAULT_IO_WORKERS
+from accurate_clock_crafter.io.texture_source import PackPayload, mapped_payload, payload_size
+from accurate_clock_crafter.utils.image_utils import decode_png
+from accurate_clock_crafter.utils.tracing import pool_task
+
+PNG_SUFFIX = ".png"
+# Sidecar textures are looked up by file name next to their base texture, not through models.
+SIDECAR_SUFFIXES = ("_e",)
+MAX_PALETTE_COLORS = 256
+
+
+@dataclass(slots=True)
+class TextureStats:
+    deduplicated: int = 0
+    bytes_before: int = 0
+    bytes_after: int = 0
+
+
+def pixel_digest(image: Image.Image) -> str:
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(f"{image.mode}:{image.width}x{image.height}:".encode("ascii"))
+    digest.update(image.tobytes())
+    return digest.hexdigest()
+
+
+def _encode_png(image: Image.Image) -> bytes:
+    buffer = io.BytesIO()
+    image.save(buffer, format="PNG", optimize=True, compress_level=9)
+    return buffer.getvalue()
+
+
+def _palette_image(image: Image.Image) -> Image.Image | None:
+    colors = image.getcolors(MAX_PALETTE_COLORS)
+    if colors is None:
+        return None
+    paletted = image.quantize(colors=len(colors), method=Image.Quantize.FASTOCTREE)
+    # Quantization is only kept when it reproduces every pixel exactly.
+    if paletted.convert("RGBA").tobytes() != image.tobytes():
+        return None
+    return paletted
+
+
+def decode_texture(payload: PackPayload) -> Image.Image:
+    with mapped_payload(payload) as data:
+        return decode_png(data)
+
+
+def optimize_png(
+    payload: PackPayload, image: Image.Image | None = None, quantize: bool = False
+) -> PackPayload:
+    if image is None:
+        image = decode_texture(payload)
+    candidates = [payload, _encode_png(image)]
+    if quantize:
+        paletted = _palette_image(image)
+        if paletted is not None:
+            candidates.append(_encode_png(paletted))
+    # The untouched source wins ties so it can still be copied without being read.
+    return min(candidates, key=payload_size)
+
+
+def _texture_rel_path(texture_ref: str) -> str:
+    return f"{texture_ref.removeprefix('minecraft:')}{PNG_SUFFIX}"
+
+
+def _texture_ref(rel_path: str) -> str:
+    return rel_path.removesuffix(PNG_SUFFIX)
+
+
+def _sidecar_paths(rel_path: str) -> list[str]:
+    stem = rel_path.removesuffix(PNG_SUFFIX)
+    return [f"{stem}{suffix}{PNG_SUFFIX}" for suffix in SIDECAR_SUFFIXES]
+
+
+def _referenced_textures(models: dict[str, Any]) -> set[str]:
+    referenced: set[str] = set()
+    for model in models.values():
+        for texture_ref in model.get("textures", {}).values():
+            if isinstance(texture_ref, str) and not texture_ref.startswith("#"):
+                referenced.add(_texture_rel_path(texture_ref))
+    return referenced
+
+
+def _rewrite_texture_refs(models: dict[str, Any], aliases: dict[str, str]) -> dict[str, Any]:
+    rewritten: dict[str, Any] = {}
+    for rel_path, model in models.items():
+        textures = model.get("textures")
+        if textures:
+            new_textures = {
+                key: _texture_ref(aliases[_texture_rel_path(ref)])
+                if isinstance(ref, str) and _texture_rel_path(ref) in aliases
+                else ref
+                for key, ref in textures.items()
+            }
+            if new_textures != textures:
+                # Models may be shared with cached or variant packs, so they are copied, not edited.
+                model = {**model, "textures": new_textures}
+        rewritten[rel_path] = model
+    return rewritten
+
+
+def optimize_pack_textures(
+    virtual_pack: VirtualPack,
+    quantize: bool = False,
+    workers: int = DEFAULT_IO_WORKERS,
+) -> tuple[VirtualPack, TextureStats]:
+    textures = virtual_pack["textures"]
+    rel_paths = sorted(textures)
+    with ThreadPoolExecutor(max_workers=max(workers, 1)) as executor:
+        decoded = executor.map(
+            pool_task(lambda rel_path: decode_texture(textures[rel_path])), rel_paths
+        )
+        images = dict(zip(rel_paths, decoded))
+    digests = {rel_path: pixel_digest(image) for rel_path, image in images.items()}
+
+    stats = TextureStats(bytes_before=sum(payload_size(payload) for payload in textures.values()))
+    referenced = _referenced_textures(virtual_pack["models"])
+    canonical_by_key: dict[tuple[str | None, ...], str] = {}
+    aliases: dict[str, str] = {}
+    for rel_path in rel_paths:
+        if rel_path not in referenced:
+            continue
+        key = (digests[rel_path], *(digests.get(p) for p in _sidecar_paths(rel_path)))
+        canonical = canonical_by_key.setdefault(key, rel_path)
+        if canonical != rel_path:
+            aliases[rel_path] = canonical
+
+    dropped = set(aliases)
+    for rel_path in aliases:
+        dropped.update(p for p in _sidecar_paths(rel_path) if p not in referenced)
+    kept = [rel_path for rel_path in rel_paths if rel_path not in dropped]
+    stats.deduplicated = len(aliases)
+
+    with ThreadPoolExecutor(max_workers=max(workers, 1)) as executor:
+        payloads = executor.map(
+            pool_task(lambda p: optimize_png(textures[p], images[p], quantize)), kept
+        )
+        optimized = dict(zip(kept, payloads))
+    stats.bytes_after = sum(payload_size(payload) for payload in optimized.values())
+
+    optimized_pack: VirtualPack = {
+        **virtual_pack,
+        "models": _rewrite_texture_refs(virtual_pack["models"], aliases),
+        "textures": optimized,
+    }
+    return optimized_pack, stats
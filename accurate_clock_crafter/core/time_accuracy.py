@@ -0,0 +1,158 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any
+
+from accurate_clock_crafter.core.time_curve import (
+    HALF_DAY_HOURS,
+    MARKER_START_TICK,
+    MINUTES_PER_DAY,
+    MINUTES_PER_HOUR,
+    TICKS_PER_DAY,
+    _numpy,
+    clock_angles,
+    threshold_table,
+)
+
+AUDIT_PERCENTILES = (50.0, 90.0, 99.0, 99.9)
+WORST_HOUR_COUNT = 3
+MINUTES_PER_TICK = MINUTES_PER_DAY / TICKS_PER_DAY
+
+
+@dataclass(frozen=True, slots=True)
+class CurveParameters:
+    # Minutes between sampled markers; the shipped curve samples the angle once per hour.
+    marker_minutes: int = MINUTES_PER_HOUR
+    step_minutes: int = 1
+    # Weight of the eased term in the assumed tick-to-angle curve.
+    blend: float = 1.0 / 3.0
+
+    def __post_init__(self) -> None:
+        if self.marker_minutes <= 0 or MINUTES_PER_DAY % self.marker_minutes != 0:
+            raise ValueError(
+                f"marker_minutes must be a positive divisor of {MINUTES_PER_DAY}, "
+                f"got {self.marker_minutes}"
+            )
+        if self.step_minutes <= 0 or MINUTES_PER_HOUR % self.step_minutes != 0:
+            raise ValueError(
+                f"step_minutes must be a positive divisor of 60, got {self.step_minutes}"
+            )
+
+    @property
+    def label(self) -> str:
+        return f"markers={self.marker_minutes}m step={self.step_minutes}m blend={self.blend:.4f}"
+
+
+SHIPPED_CURVE = CurveParameters()
+
+
+@dataclass(frozen=True, slots=True)
+class AccuracyReport:
+    parameters: CurveParameters
+    samples: int
+    max_error: float
+    mean_error: float
+    percentiles: dict[float, float]
+    # Samples whose displayed minute is not the true time rounded down to the step.
+    wrong_samples: int
+    max_drift: float
+    worst_hours: tuple[tuple[int, float], ...]
+
+    def to_json(self) -> dict:
+        return {
+            "parameters": {
+                "marker_minutes": self.parameters.marker_minutes,
+                "step_minutes": self.parameters.step_minutes,
+                "blend": self.parameters.blend,
+            },
+            "samples": self.samples,
+            "max_error": self.max_error,
+            "mean_error": self.mean_error,
+            "percentiles": {f"p{key:g}": value for key, value in self.percentiles.items()},
+            "wrong_samples": self.wrong_samples,
+            "max_drift": self.max_drift,
+            "worst_hours": [{"hour": hour, "max_error": error} for hour, error in self.worst_hours],
+        }
+
+
+def _require_numpy() -> Any:
+    np = _numpy()
+    if np is None:
+        raise RuntimeError("The time accuracy audit needs numpy; install it with pip install numpy")
+    return np
+
+
+def curve_thresholds(parameters: CurveParameters = SHIPPED_CURVE) -> Any:
+    np = _require_numpy()
+    if (
+        parameters.marker_minutes == SHIPPED_CURVE.marker_minutes
+        and parameters.blend == SHIPPED_CURVE.blend
+    ):
+        # The shipped parameters are audited against the exact table the builders emit.
+        return np.asarray(threshold_table(parameters.step_minutes))
+
+    marker_minutes = np.arange(0, MINUTES_PER_DAY + 1, parameters.marker_minutes)
+    ticks = MARKER_START_TICK + marker_minutes / MINUTES_PER_TICK
+    x = ((ticks % TICKS_PER_DAY) / TICKS_PER_DAY - 0.25 + 1.0) % 1.0
+    theta = 1.0 - (np.cos(np.pi * x) + 1.0) / 2.0
+    angles = x + (theta - x) * parameters.blend
+    # Same unwrap/normalize steps as accurate_hour_markers, over the whole array.
+    angles = angles + np.concatenate(([0.0], np.cumsum(np.diff(angles) < 0)))
+    markers = (angles - angles[0]) / (angles[-1] - angles[0])
+    if np.any(np.diff(markers) < -1e-9):
+        raise ValueError(f"Curve {parameters.label} produces non-monotonic markers")
+
+    row_minutes = np.arange(0, MINUTES_PER_DAY, parameters.step_minutes)
+    segment = row_minutes // parameters.marker_minutes
+    fraction = (row_minutes % parameters.marker_minutes) / parameters.marker_minutes
+    return ((1 - fraction) * markers[segment] + fraction * markers[segment + 1]) * TICKS_PER_DAY
+
+
+def audit_time_curve(
+    parameters: CurveParameters = SHIPPED_CURVE,
+    subticks: int = 1,
+    single_precision: bool = True,
+) -> AccuracyReport:
+    np = _require_numpy()
+    if subticks <= 0:
+        raise ValueError(f"subticks must be positive, got {subticks}")
+    ticks = np.arange(int(TICKS_PER_DAY) * subticks, dtype=np.float64) / subticks
+    thresholds = curve_thresholds(parameters)
+    dispatch_values = clock_angles(ticks)
+    if single_precision:
+        # Matches the game, which compares the scaled property against float thresholds.
+        thresholds = thresholds.astype(np.float32)
+        dispatch_values = dispatch_values.astype(np.float32) * np.float32(TICKS_PER_DAY)
+    else:
+        dispatch_values = dispatch_values * TICKS_PER_DAY
+    rows = np.searchsorted(thresholds, dispatch_values, side="right") - 1
+    rows = np.clip(rows, 0, len(thresholds) - 1)
+
+    # Row 0 starts at tick 6000, which the clock shows as 12:00.
+    half_day = HALF_DAY_HOURS * MINUTES_PER_HOUR
+    displayed = (half_day + rows * parameters.step_minutes) % MINUTES_PER_DAY
+    true_minutes = ((ticks + MARKER_START_TICK) % TICKS_PER_DAY) * MINUTES_PER_TICK
+    error = (displayed - true_minutes + half_day) % MINUTES_PER_DAY - half_day
+    absolute = np.abs(error)
+    expected = (true_minutes // parameters.step_minutes) * parameters.step_minutes
+    drift = (displayed - expected + half_day) % MINUTES_PER_DAY - half_day
+
+    hours = (true_minutes // MINUTES_PER_HOUR).astype(np.int64)
+    hour_errors = np.zeros(24)
+    np.maximum.at(hour_errors, hours, absolute)
+    worst = np.argsort(-hour_errors, kind="stable")[:WORST_HOUR_COUNT]
+    return AccuracyReport(
+        parameters=parameters,
+        samples=len(ticks),
+        max_error=float(absolute.max()),
+        mean_error=float(error.mean()),
+        percentiles={
+            percentile: float(value)
+            for percentile, value in zip(
+                AUDIT_PERCENTILES, np.percentile(absolute, AUDIT_PERCENTILES)
+            )
+        },
+        wrong_samples=int(np.count_nonzero(drift)),
+        max_drift=float(np.abs(drift).max()),
+        worst_hours=tuple((int(hour), float(hour_errors[hour])) for hour in worst),
+    )
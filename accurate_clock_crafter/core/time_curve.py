@@ -1,8 +1,19 @@
 from __future__ import annotations
 
 import math
+from array import array
+from bisect import bisect_right
+from functools import lru_cache
+from typing import Any, Sequence
+
 
 TICKS_PER_DAY = 24000.0
+HOURS_PER_DAY = 24
+HALF_DAY_HOURS = 12
+MINUTES_PER_HOUR = 60
+MINUTES_PER_DAY = HOURS_PER_DAY * MINUTES_PER_HOUR
+# Hour markers start at tick 6000, which the clock face shows as 12:00.
+MARKER_START_TICK = 6000
 
 
 def _hour_label(index: int) -> str:
@@ -44,11 +55,136 @@ def _normalize(values: list[float]) -> list[float]:
     return [(value - start) / (end - start) for value in values]
 
 
-def generate_accurate_hour_markers() -> list[float]:
+@lru_cache(maxsize=1)
+def accurate_hour_markers() -> tuple[float, ...]:
     raw_values = [_clock_angle_from_tick((hour + 6) * 1000) for hour in range(25)]
     unwrapped_values = _unwrap_cycle(raw_values)
     result = _normalize(unwrapped_values)
     result[0] = 0.0
     result[-1] = 1.0
     _assert_monotonic(result)
-    return result
+    return tuple(result)
+
+
+def generate_accurate_hour_markers() -> list[float]:
+    return list(accurate_hour_markers())
+
+
+@lru_cache(maxsize=1)
+def _numpy() -> Any:
+    # numpy is optional and slow to import, so it is loaded on the first vectorized call.
+    try:
+        import numpy
+    except ImportError:  # pragma: no cover
+        return None
+    return numpy
+
+
+def _check_step(step_minutes: int) -> None:
+    if step_minutes <= 0 or MINUTES_PER_HOUR % step_minutes != 0:
+        raise ValueError(f"step_minutes must be a positive divisor of 60, got {step_minutes}")
+
+
+def _threshold_list(step_minutes: int) -> list[float]:
+    accurate_hours = [ratio * TICKS_PER_DAY for ratio in accurate_hour_markers()]
+    values: list[float] = []
+    for hour in range(HOURS_PER_DAY):
+        lower, upper = accurate_hours[hour], accurate_hours[hour + 1]
+        for minute in range(0, MINUTES_PER_HOUR, step_minutes):
+            fraction = minute / MINUTES_PER_HOUR
+            values.append((1 - fraction) * lower + fraction * upper)
+    return values
+
+
+@lru_cache(maxsize=None)
+def threshold_table(step_minutes: int = 1) -> Any:
+    # Cached and read-only, so callers share one table instead of rebuilding it per call.
+    _check_step(step_minutes)
+    np = _numpy()
+    if np is None:
+        return array("d", _threshold_list(step_minutes))
+    accurate_hours = np.asarray(accurate_hour_markers()) * TICKS_PER_DAY
+    lower = np.repeat(accurate_hours[:-1], MINUTES_PER_HOUR // step_minutes)
+    upper = np.repeat(accurate_hours[1:], MINUTES_PER_HOUR // step_minutes)
+    fractions = np.tile(
+        np.arange(0, MINUTES_PER_HOUR, step_minutes) / MINUTES_PER_HOUR, HOURS_PER_DAY
+    )
+    table = (1 - fractions) * lower + fractions * upper
+    table.flags.writeable = False
+    return table
+
+
+@lru_cache(maxsize=None)
+def _dispatch_thresholds(step_minutes: int) -> Any:
+    # The game compares the scaled time property against float thresholds.
+    np = _numpy()
+    if np is None:
+        return array("f", threshold_table(step_minutes))
+    table = threshold_table(step_minutes).astype(np.float32)
+    table.flags.writeable = False
+    return table
+
+
+@lru_cache(maxsize=None)
+def table_display_times(step_minutes: int = 1) -> tuple[tuple[int, int], ...]:
+    _check_step(step_minutes)
+    return tuple(
+        ((marker_hour + HALF_DAY_HOURS) % HOURS_PER_DAY, minute)
+        for marker_hour in range(HOURS_PER_DAY)
+        for minute in range(0, MINUTES_PER_HOUR, step_minutes)
+    )
+
+
+def clock_angles(ticks: Sequence[float]) -> Any:
+    np = _numpy()
+    if np is None:
+        return [_clock_angle_from_tick(tick) for tick in ticks]
+    x = (np.asarray(ticks, dtype=np.float64) % TICKS_PER_DAY) / TICKS_PER_DAY - 0.25
+    x = (x + 1.0) % 1.0
+    theta = 1.0 - (np.cos(np.pi * x) + 1.0) / 2.0
+    return x + (theta - x) / 3.0
+
+
+@lru_cache(maxsize=None)
+def _display_rows(step_minutes: int) -> tuple[Any, Any]:
+    display_times = table_display_times(step_minutes)
+    hours = [hour for hour, _ in display_times]
+    minutes = [minute for _, minute in display_times]
+    np = _numpy()
+    if np is None:
+        return array("b", hours), array("b", minutes)
+    hours_by_row = np.array(hours, dtype=np.int8)
+    minutes_by_row = np.array(minutes, dtype=np.int8)
+    hours_by_row.flags.writeable = minutes_by_row.flags.writeable = False
+    return hours_by_row, minutes_by_row
+
+
+def _single(value: float) -> float:
+    return array("f", (value,))[0]
+
+
+def ticks_to_display_time(
+    ticks: Sequence[float] | None = None, step_minutes: int = 1
+) -> tuple[Any, Any]:
+    # Compared in float32 like the game, so marker ticks such as 15000 show 20:59 as in-game.
+    if ticks is None:
+        ticks = range(int(TICKS_PER_DAY))
+    thresholds = _dispatch_thresholds(step_minutes)
+    hours_by_row, minutes_by_row = _display_rows(step_minutes)
+
+    np = _numpy()
+    if np is not None:
+        dispatch_values = clock_angles(ticks).astype(np.float32) * np.float32(TICKS_PER_DAY)
+        rows = np.searchsorted(thresholds, dispatch_values, side="right") - 1
+        rows = np.clip(rows, 0, len(thresholds) - 1)
+        return hours_by_row[rows], minutes_by_row[rows]
+
+    hours = array("b")
+    minutes = array("b")
+    for angle in clock_angles(ticks):
+        # Both factors are float32, so their double product is exact before rounding.
+        value = _single(_single(angle) * TICKS_PER_DAY)
+        row = min(max(bisect_right(thresholds, value) - 1, 0), len(thresholds) - 1)
+        hours.append(hours_by_row[row])
+        minutes.append(minutes_by_row[row])
+    return hours, minutes
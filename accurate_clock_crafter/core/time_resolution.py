@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+MINUTES_PER_HOUR = 60
+MINUTES_PER_HALF_DAY = 12 * MINUTES_PER_HOUR
+
+
+@dataclass(frozen=True, slots=True)
+class TimeResolution:
+    minute_step: int = 1
+    hour_hand_step: int = 1
+
+    def __post_init__(self) -> None:
+        if self.minute_step <= 0 or MINUTES_PER_HOUR % self.minute_step != 0:
+            raise ValueError(
+                f"resolution.minute_step must be a positive divisor of 60, got {self.minute_step}"
+            )
+        if (
+            self.hour_hand_step < self.minute_step
+            or self.hour_hand_step % self.minute_step != 0
+            or MINUTES_PER_HOUR % self.hour_hand_step != 0
+        ):
+            raise ValueError(
+                "resolution.hour_hand_step must be a divisor of 60 and a multiple of "
+                f"minute_step ({self.minute_step}), got {self.hour_hand_step}"
+            )
+
+    def minutes(self) -> range:
+        return range(0, MINUTES_PER_HOUR, self.minute_step)
+
+    def hour_hand_minutes(self, hour: int, minute: int) -> int:
+        total_minutes = (hour * MINUTES_PER_HOUR + minute) % MINUTES_PER_HALF_DAY
+        return total_minutes - total_minutes % self.hour_hand_step
+
+
+DEFAULT_TIME_RESOLUTION = TimeResolution()
+
+
+def load_time_resolution(template_meta: dict) -> TimeResolution:
+    resolution = template_meta.get("resolution")
+    if resolution is None:
+        return DEFAULT_TIME_RESOLUTION
+    if not isinstance(resolution, dict):
+        raise ValueError("pack.mcmeta 'resolution' must be an object")
+    minute_step = int(resolution.get("minute_step", 1))
+    hour_hand_step = int(resolution.get("hour_hand_step", minute_step))
+    return TimeResolution(minute_step=minute_step, hour_hand_step=hour_hand_step)
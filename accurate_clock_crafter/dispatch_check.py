@@ -0,0 +1,192 @@
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import zipfile
+from pathlib import Path
+from typing import Collection, Mapping
+
+from accurate_clock_crafter.core.item_model_resolver import (
+    CUSTOM_NAME_COMPONENT,
+    OVERWORLD,
+    DispatchContext,
+    ItemModelResolver,
+    ResolvedModels,
+)
+from accurate_clock_crafter.io.pack_writer import ITEMS_PREFIX, MODELS_PREFIX
+from accurate_clock_crafter.utils.naming import pack_resource_key
+from accurate_clock_crafter.utils.tracing import log
+
+CLOCK_ITEM_PATH = f"{ITEMS_PREFIX}clock.json"
+PACK_MODEL_PREFIX = "item/clock/"
+# Any dimension other than the overworld takes the random-source fallback.
+OTHER_DIMENSION = "minecraft:the_nether"
+
+
+def _model_path(model_name: str) -> str:
+    return model_name.removeprefix("minecraft:")
+
+
+def _resource_key(resolved: ResolvedModels) -> str | None:
+    for model_name in sorted(resolved.model_paths()):
+        path = _model_path(model_name)
+        if path.startswith(PACK_MODEL_PREFIX):
+            return path[len(PACK_MODEL_PREFIX) :].split("/")[0]
+    return None
+
+
+def _check_resolved(
+    label: str, resolved: ResolvedModels, models: Collection[str]
+) -> list[str]:
+    issues: list[str] = []
+    unresolved = resolved.unresolved_positions()
+    if unresolved:
+        issues.append(
+            f"{label}: {len(unresolved)} tick(s) resolve to no model, first at tick {unresolved[0]}"
+        )
+    # Only models under item/clock/ ship with the pack; anything else is a vanilla model.
+    missing = sorted(
+        path
+        for path in map(_model_path, resolved.model_paths())
+        if path.startswith(PACK_MODEL_PREFIX) and path not in models
+    )
+    if missing:
+        issues.append(
+            f"{label}: {len(missing)} resolved model(s) missing from the pack, e.g. {missing[0]}"
+        )
+    return issues
+
+
+def _compare_resolved(label: str, actual: ResolvedModels, expected: ResolvedModels) -> list[str]:
+    if len(actual.layers) != len(expected.layers):
+        return [
+            f"{label}: resolves {len(actual.layers)} layer(s), "
+            f"the variant pack resolves {len(expected.layers)}"
+        ]
+    for layer in range(len(actual.layers)):
+        actual_paths = actual.layer_paths(layer)
+        expected_paths = expected.layer_paths(layer)
+        if actual_paths != expected_paths:
+            position = next(
+                i for i, (a, b) in enumerate(zip(actual_paths, expected_paths)) if a != b
+            )
+            return [
+                f"{label}: differs from the variant pack at tick {position} "
+                f"({actual_paths[position]} != {expected_paths[position]})"
+            ]
+    return []
+
+
+def _variant_names(clock_item: dict) -> list[str]:
+    model = clock_item.get("model", {})
+    if model.get("type") != "minecraft:select" or model.get("component") != CUSTOM_NAME_COMPONENT:
+        return []
+    names: list[str] = []
+    for case in model.get("cases", []):
+        when = case.get("when")
+        names.extend(when if isinstance(when, list) else [when])
+    return names
+
+
+def check_item_dispatch(
+    clock_item: dict,
+    models: Collection[str],
+    variant_items: Mapping[str, dict] | None = None,
+) -> list[str]:
+    # variant_items maps resource keys to each variant pack's own clock.json, when available.
+    issues: list[str] = []
+    names = _variant_names(clock_item)
+    duplicates = sorted({name for name in names if names.count(name) > 1})
+    if duplicates:
+        issues.append(f"custom_name case(s) listed more than once: {', '.join(duplicates)}")
+
+    resolver = ItemModelResolver(clock_item)
+    variant_resolvers = {
+        key: ItemModelResolver(item) for key, item in (variant_items or {}).items()
+    }
+    for name in [*names, None]:
+        label = name if name is not None else "(unnamed clock)"
+        for dimension in (OVERWORLD, OTHER_DIMENSION):
+            context = DispatchContext(custom_name=name, dimension=dimension)
+            resolved = resolver.resolve(context=context)
+            issues.extend(_check_resolved(f"{label} in {dimension}", resolved, models))
+            expected = variant_resolvers.get(_resource_key(resolved))
+            if name is not None and expected is not None:
+                issues.extend(
+                    _compare_resolved(
+                        f"{label} in {dimension}",
+                        resolved,
+                        expected.resolve(context=DispatchContext(dimension=dimension)),
+                    )
+                )
+    return issues
+
+
+def enforce_item_dispatch(
+    pack_name: str,
+    clock_item: dict,
+    models: Collection[str],
+    variant_items: Mapping[str, dict] | None = None,
+) -> None:
+    issues = check_item_dispatch(clock_item, models, variant_items)
+    for issue in issues:
+        log("dispatch", issue)
+    if issues:
+        raise ValueError(
+            f"{pack_name} clock.json failed the dispatch check in {len(issues)} place(s)"
+        )
+    log(
+        "dispatch",
+        f"{pack_name}: {len(_variant_names(clock_item))} variants resolve on every tick.",
+    )
+
+
+def load_pack_dispatch(path: Path) -> tuple[dict, set[str]]:
+    if path.is_dir():
+        with open(path / CLOCK_ITEM_PATH, "r", encoding="utf-8") as f:
+            clock_item = json.load(f)
+        entry_names = [file.relative_to(path).as_posix() for file in path.rglob("*.json")]
+    elif zipfile.is_zipfile(path):
+        with zipfile.ZipFile(path) as archive:
+            clock_item = json.loads(archive.read(CLOCK_ITEM_PATH))
+            entry_names = archive.namelist()
+    else:
+        raise FileNotFoundError(f"Not a pack directory or zip archive: {path}")
+    models = {
+        name[len(MODELS_PREFIX) :].removesuffix(".json")
+        for name in entry_names
+        if name.startswith(MODELS_PREFIX) and name.endswith(".json")
+    }
+    return clock_item, models
+
+
+def run(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Resolve every daytime tick of a built clock.json and check the result."
+    )
+    parser.add_argument("pack", type=Path, help="built composite pack directory or .zip archive")
+    parser.add_argument(
+        "--variant",
+        type=Path,
+        action="append",
+        default=[],
+        help="variant pack whose own clock.json its composite case must match",
+    )
+    args = parser.parse_args(argv)
+
+    clock_item, models = load_pack_dispatch(args.pack)
+    variant_items = {
+        pack_resource_key(variant.name.removesuffix(".zip")): load_pack_dispatch(variant)[0]
+        for variant in args.variant
+    }
+    try:
+        enforce_item_dispatch(args.pack.name, clock_item, models, variant_items)
+    except ValueError as exc:
+        log("error", str(exc))
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(run())
@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Iterable
+
+from accurate_clock_crafter.io.texture_source import PackPayload, TextureSource, copy_texture
+from accurate_clock_crafter.utils.tracing import pool_task
+
+DEFAULT_IO_WORKERS = 16
+
+
+def ensure_parent_dirs(paths: Iterable[Path]) -> None:
+    # Sorted so each parent exists before its children and mkdir never has to recurse.
+    for directory in sorted({path.parent for path in paths}):
+        directory.mkdir(parents=True, exist_ok=True)
+
+
+def _is_hardlinked(path: Path) -> bool:
+    try:
+        return os.stat(path).st_nlink > 1
+    except FileNotFoundError:
+        return False
+
+
+def _write_file(item: tuple[Path, PackPayload], link: bool = False) -> None:
+    path, payload = item
+    # A file hard-linked by --link-textures is unlinked first, so the rewrite cannot
+    # truncate the template file it shares; anything else is simply truncated on open.
+    if link or _is_hardlinked(path):
+        path.unlink(missing_ok=True)
+    if isinstance(payload, TextureSource):
+        copy_texture(payload, path, link)
+        return
+    with open(path, "wb") as f:
+        f.write(payload)
+
+
+def write_files(
+    files: dict[Path, PackPayload], workers: int = DEFAULT_IO_WORKERS, link: bool = False
+) -> None:
+    ensure_parent_dirs(files)
+    if len(files) <= 1 or workers <= 1:
+        for item in files.items():
+            _write_file(item, link)
+        return
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for _ in executor.map(pool_task(lambda item: _write_file(item, link)), files.items()):
+            pass
@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import pickle
+from functools import lru_cache
+from pathlib import Path
+from typing import Callable
+
+from accurate_clock_crafter._version import __version__
+from accurate_clock_crafter.core.build_options import BuildOptions, generation_settings
+from accurate_clock_crafter.core.model_dispatch import VirtualPack, create_virtual_pack
+from accurate_clock_crafter.io.assets_loader import resolve_template_dir
+from accurate_clock_crafter.utils.tracing import log
+
+PACKAGE_DIR = Path(__file__).resolve().parent.parent
+CACHE_FORMAT_VERSION = 1
+
+
+@lru_cache(maxsize=1)
+def generator_digest() -> str:
+    digest = hashlib.blake2b(digest_size=16)
+    for source in sorted(PACKAGE_DIR.rglob("*.py")):
+        digest.update(source.relative_to(PACKAGE_DIR).as_posix().encode("utf-8"))
+        digest.update(source.read_bytes())
+    return digest.hexdigest()
+
+
+def template_digest(template_dir: Path) -> str:
+    digest = hashlib.blake2b(digest_size=16)
+    for file in sorted(path for path in template_dir.rglob("*") if path.is_file()):
+        digest.update(file.relative_to(template_dir).as_posix().encode("utf-8"))
+        digest.update(hashlib.blake2b(file.read_bytes(), digest_size=16).digest())
+    return digest.hexdigest()
+
+
+def template_cache_key(template_dir: Path, builder_name: str, options: BuildOptions) -> str:
+    digest = hashlib.blake2b(digest_size=16)
+    for part in (
+        f"format={CACHE_FORMAT_VERSION}",
+        f"version={__version__}",
+        f"generator={generator_digest()}",
+        f"builder={builder_name}",
+        # Cached packs reference template textures by absolute path, so a moved or copied
+        # checkout must not reuse them.
+        f"location={template_dir.resolve().as_posix()}",
+        f"template={template_digest(template_dir)}",
+        f"settings={sorted(generation_settings(options).items())!r}",
+    ):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def cache_path_for(cache_dir: str, template_name: str) -> Path:
+    return Path(cache_dir) / f"{template_name}.pickle"
+
+
+def load_cached_pack(cache_path: Path, key: str) -> VirtualPack | None:
+    try:
+        with open(cache_path, "rb") as f:
+            cached = pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+        return None
+    if not isinstance(cached, dict) or cached.get("key") != key:
+        return None
+    return cached["pack"]
+
+
+def store_cached_pack(cache_path: Path, key: str, virtual_pack: VirtualPack) -> None:
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+    with open(tmp_path, "wb") as f:
+        pickle.dump({"key": key, "pack": virtual_pack}, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, cache_path)
+
+
+def load_or_build_virtual_pack(
+    template_name: str,
+    options: BuildOptions,
+    build: Callable[[VirtualPack, BuildOptions], None],
+) -> VirtualPack:
+    if options.cache_dir is None:
+        virtual_pack = create_virtual_pack(template_name)
+        build(virtual_pack, options)
+        return virtual_pack
+
+    template_dir = resolve_template_dir(template_name)
+    key = template_cache_key(template_dir, f"{build.__module__}.{build.__qualname__}", options)
+    cache_path = cache_path_for(options.cache_dir, template_name)
+    cached_pack = load_cached_pack(cache_path, key)
+    if cached_pack is not None:
+        log("cache", f"{template_name}: reusing cached build")
+        return cached_pack
+
+    virtual_pack = create_virtual_pack(template_name)
+    build(virtual_pack, options)
+    store_cached_pack(cache_path, key, virtual_pack)
+    return virtual_pack
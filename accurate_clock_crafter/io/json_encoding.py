@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass
+from typing import Any, Iterable, Literal
+
+from accurate_clock_crafter.utils.tracing import log
+
+try:
+    import orjson as _orjson
+except ImportError:  # pragma: no cover
+    _orjson = None
+
+JsonBackend = Literal["auto", "json", "orjson"]
+
+
+@dataclass(frozen=True, slots=True)
+class JsonProfile:
+    name: str
+    indent: int | None = None
+    separators: tuple[str, str] | None = None
+    float_precision: int | None = None
+    backend: JsonBackend = "auto"
+
+
+PRETTY_JSON_PROFILE = JsonProfile(name="pretty", indent=4)
+COMPACT_JSON_PROFILE = JsonProfile(name="compact", separators=(",", ":"), float_precision=3)
+
+JSON_PROFILES: dict[str, JsonProfile] = {
+    PRETTY_JSON_PROFILE.name: PRETTY_JSON_PROFILE,
+    COMPACT_JSON_PROFILE.name: COMPACT_JSON_PROFILE,
+}
+
+
+def expand_compact(value: Any) -> Any:
+    # Compact containers such as RangeTable expose to_json() and are expanded on demand.
+    to_json = getattr(value, "to_json", None)
+    if to_json is None:
+        raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+    return to_json()
+
+
+def round_floats(payload: Any, precision: int) -> Any:
+    if hasattr(payload, "to_json"):
+        return round_floats(payload.to_json(), precision)
+    if isinstance(payload, float):
+        return round(payload, precision)
+    if isinstance(payload, dict):
+        return {key: round_floats(value, precision) for key, value in payload.items()}
+    if isinstance(payload, list):
+        return [round_floats(value, precision) for value in payload]
+    return payload
+
+
+def _use_orjson(profile: JsonProfile) -> bool:
+    if profile.backend == "json":
+        return False
+    # orjson only emits compact output or a fixed two-space indent.
+    if profile.backend == "orjson":
+        if _orjson is None:
+            raise RuntimeError("JSON backend 'orjson' requested but orjson is not installed")
+        if profile.indent is not None:
+            raise ValueError(
+                f"JSON backend 'orjson' cannot indent by {profile.indent}; "
+                f"profile '{profile.name}' needs the 'json' backend"
+            )
+        return True
+    return _orjson is not None and profile.indent is None
+
+
+def encode_json(payload: Any, profile: JsonProfile = PRETTY_JSON_PROFILE) -> bytes:
+    if profile.float_precision is not None:
+        payload = round_floats(payload, profile.float_precision)
+    if _use_orjson(profile):
+        return _orjson.dumps(payload, default=expand_compact)
+    return json.dumps(
+        payload,
+        ensure_ascii=False,
+        indent=profile.indent,
+        separators=profile.separators,
+        default=expand_compact,
+    ).encode("utf-8")
+
+
+def report_json_savings(label: str, payloads: Iterable[Any], profile: JsonProfile) -> None:
+    encoded_bytes = 0
+    pretty_bytes = 0
+    for payload in payloads:
+        encoded_bytes += len(encode_json(payload, profile))
+        pretty_bytes += len(encode_json(payload, PRETTY_JSON_PROFILE))
+    saved = pretty_bytes - encoded_bytes
+    ratio = saved / pretty_bytes * 100 if pretty_bytes else 0.0
+    log(
+        "json",
+        f"{label}: {encoded_bytes} bytes as '{profile.name}' vs {pretty_bytes} pretty "
+        f"({saved} bytes saved, {ratio:.1f}%)",
+    )
@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import os
+import struct
+import zlib
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator
+
+from accurate_clock_crafter.io.texture_source import PackPayload, mapped_payload
+from accurate_clock_crafter.utils.tracing import pool_task
+
+ZIP_STORED = 0
+ZIP_DEFLATED = 8
+ZIP_VERSION = 20
+ZIP_UTF8_FLAG = 0x800
+# 1980-01-01 00:00:00, the earliest timestamp a zip entry can carry.
+ZIP_FIXED_DATE = (1 << 5) | 1
+ZIP_FIXED_TIME = 0
+ZIP_FILE_ATTRIBUTES = 0o100644 << 16
+ZIP_MAX_ENTRIES = 0xFFFF
+ZIP_MAX_OFFSET = 0xFFFFFFFF
+DEFAULT_COMPRESSION_LEVEL = 6
+# Entries compressed ahead of the writer, per worker; bounds how many are held in memory.
+COMPRESSION_WINDOW_PER_WORKER = 2
+
+_LOCAL_HEADER = struct.Struct("<4sHHHHHIIIHH")
+_CENTRAL_HEADER = struct.Struct("<4sHHHHHHIIIHHHHHII")
+_END_OF_CENTRAL_DIR = struct.Struct("<4sHHHHIIH")
+
+
+@dataclass(frozen=True, slots=True)
+class _CompressedEntry:
+    name: bytes
+    crc: int
+    size: int
+    method: int
+    payload: bytes
+
+
+def _compress_entry(name: str, source: PackPayload, level: int) -> _CompressedEntry:
+    with mapped_payload(source) as data:
+        compressor = zlib.compressobj(level, zlib.DEFLATED, -zlib.MAX_WBITS)
+        compressed = compressor.compress(data) + compressor.flush()
+        if len(compressed) < len(data):
+            method, payload = ZIP_DEFLATED, compressed
+        else:
+            method, payload = ZIP_STORED, bytes(data)
+        return _CompressedEntry(
+            name=name.encode("utf-8"),
+            crc=zlib.crc32(data),
+            size=len(data),
+            method=method,
+            payload=payload,
+        )
+
+
+def _local_header(entry: _CompressedEntry) -> bytes:
+    return _LOCAL_HEADER.pack(
+        b"PK\x03\x04",
+        ZIP_VERSION,
+        ZIP_UTF8_FLAG,
+        entry.method,
+        ZIP_FIXED_TIME,
+        ZIP_FIXED_DATE,
+        entry.crc,
+        len(entry.payload),
+        entry.size,
+        len(entry.name),
+        0,
+    )
+
+
+def _central_header(entry: _CompressedEntry, offset: int) -> bytes:
+    return _CENTRAL_HEADER.pack(
+        b"PK\x01\x02",
+        ZIP_VERSION,
+        ZIP_VERSION,
+        ZIP_UTF8_FLAG,
+        entry.method,
+        ZIP_FIXED_TIME,
+        ZIP_FIXED_DATE,
+        entry.crc,
+        len(entry.payload),
+        entry.size,
+        len(entry.name),
+        0,
+        0,
+        0,
+        0,
+        ZIP_FILE_ATTRIBUTES,
+        offset,
+    )
+
+
+def _compressed_in_order(
+    executor: ThreadPoolExecutor,
+    entries: dict[str, PackPayload],
+    names: list[str],
+    level: int,
+    window: int,
+) -> Iterator[_CompressedEntry]:
+    pending: deque[Future[_CompressedEntry]] = deque()
+    compress = pool_task(_compress_entry)
+    for name in names:
+        if len(pending) >= window:
+            yield pending.popleft().result()
+        pending.append(executor.submit(compress, name, entries[name], level))
+    while pending:
+        yield pending.popleft().result()
+
+
+def write_pack_archive(
+    archive_path: Path,
+    entries: dict[str, PackPayload],
+    workers: int | None = None,
+    level: int = DEFAULT_COMPRESSION_LEVEL,
+) -> None:
+    if len(entries) > ZIP_MAX_ENTRIES:
+        raise ValueError(
+            f"Archive {archive_path} would hold {len(entries)} entries; "
+            f"at most {ZIP_MAX_ENTRIES} are supported without zip64"
+        )
+
+    names = sorted(entries)
+    archive_path.parent.mkdir(parents=True, exist_ok=True)
+    central_directory: list[bytes] = []
+    offset = 0
+
+    workers = workers or min(32, (os.cpu_count() or 1) + 4)
+    window = workers * COMPRESSION_WINDOW_PER_WORKER
+    with ThreadPoolExecutor(max_workers=workers) as executor, open(archive_path, "wb") as f:
+        for entry in _compressed_in_order(executor, entries, names, level, window):
+            if offset > ZIP_MAX_OFFSET:
+                raise ValueError(f"Archive {archive_path} exceeds 4 GiB; zip64 is not supported")
+            central_directory.append(_central_header(entry, offset) + entry.name)
+            record = _local_header(entry) + entry.name
+            f.write(record)
+            f.write(entry.payload)
+            offset += len(record) + len(entry.payload)
+
+        if offset > ZIP_MAX_OFFSET:
+            raise ValueError(f"Archive {archive_path} exceeds 4 GiB; zip64 is not supported")
+        central_directory_bytes = b"".join(central_directory)
+        f.write(central_directory_bytes)
+        f.write(
+            _END_OF_CENTRAL_DIR.pack(
+                b"PK\x05\x06",
+                0,
+                0,
+                len(names),
+                len(names),
+                len(central_directory_bytes),
+                offset,
+                0,
+            )
+        )
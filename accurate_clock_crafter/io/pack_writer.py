@@ -1,39 +1,252 @@
 from __future__ import annotations
 
 import json
+import os
+from dataclasses import dataclass
 from pathlib import Path
 import shutil
 
+from accurate_clock_crafter.core.build_options import DEFAULT_BUILD_OPTIONS, BuildOptions
 from accurate_clock_crafter.core.model_dispatch import VirtualPack
+from accurate_clock_crafter.io.batch_io import DEFAULT_IO_WORKERS, write_files
+from accurate_clock_crafter.io.json_encoding import (
+    PRETTY_JSON_PROFILE,
+    JsonProfile,
+    encode_json,
+    report_json_savings,
+)
+from accurate_clock_crafter.io.pack_archive import write_pack_archive
+from accurate_clock_crafter.io.texture_source import PackPayload, payload_digest, payload_size
+from accurate_clock_crafter.utils.tracing import count_io, log, trace_span
 
+ITEMS_PREFIX = "assets/minecraft/items/"
+MODELS_PREFIX = "assets/minecraft/models/"
+TEXTURES_PREFIX = "assets/minecraft/textures/"
+MANIFEST_SUFFIX = ".manifest.json"
+MANIFEST_VERSION = 1
 
-def _write_json_files(base_dir: Path, entries: dict[str, dict]) -> None:
-    for rel_path, payload in entries.items():
-        output_path = base_dir / rel_path
-        output_path.parent.mkdir(parents=True, exist_ok=True)
-        with open(output_path, "w", encoding="utf-8") as f:
-            json.dump(payload, f, ensure_ascii=False, indent=4)
 
+@dataclass(frozen=True, slots=True)
+class SerializedPack:
+    virtual_pack: VirtualPack
+    entries: dict[str, PackPayload]
+    profile: JsonProfile
+
+
+@dataclass(slots=True)
+class PackWriteStats:
+    written: int = 0
+    unchanged: int = 0
+    removed: int = 0
+    bytes_written: int = 0
+
+
+def serialize_virtual_pack(
+    virtual_pack: VirtualPack,
+    profile: JsonProfile = PRETTY_JSON_PROFILE,
+    previous: SerializedPack | None = None,
+) -> dict[str, PackPayload]:
+    if previous is not None and previous.profile != profile:
+        previous = None
+
+    def encode(entry_path: str, payload: dict, previous_payload: dict | None) -> PackPayload:
+        # Payloads equal to the ones the previous serialization encoded reuse its bytes.
+        if previous is not None and previous_payload is not None:
+            cached = previous.entries.get(entry_path)
+            if cached is not None and (previous_payload is payload or previous_payload == payload):
+                return cached
+        return encode_json(payload, profile)
+
+    previous_pack = previous.virtual_pack if previous is not None else None
+    entries: dict[str, PackPayload] = {
+        "pack.mcmeta": encode(
+            "pack.mcmeta",
+            virtual_pack["pack_mcmeta"],
+            previous_pack["pack_mcmeta"] if previous_pack is not None else None,
+        )
+    }
+    for section, prefix in (("items", ITEMS_PREFIX), ("models", MODELS_PREFIX)):
+        previous_payloads = previous_pack[section] if previous_pack is not None else {}
+        for rel_path, payload in virtual_pack[section].items():
+            entries[f"{prefix}{rel_path}"] = encode(
+                f"{prefix}{rel_path}", payload, previous_payloads.get(rel_path)
+            )
+    for rel_path, payload in virtual_pack["textures"].items():
+        entries[f"{TEXTURES_PREFIX}{rel_path}"] = payload
+    return entries
+
+
+def manifest_path_for(output_pack_dir: Path) -> Path:
+    return output_pack_dir.with_name(f"{output_pack_dir.name}{MANIFEST_SUFFIX}")
+
+
+def load_manifest(output_pack_dir: Path) -> dict[str, str] | None:
+    manifest_path = manifest_path_for(output_pack_dir)
+    if not output_pack_dir.is_dir() or not manifest_path.is_file():
+        return None
+    try:
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if data.get("version") != MANIFEST_VERSION:
+        return None
+    return data.get("entries")
+
+
+def save_manifest(output_pack_dir: Path, hashes: dict[str, str]) -> None:
+    manifest_path = manifest_path_for(output_pack_dir)
+    tmp_path = manifest_path.with_name(f"{manifest_path.name}.tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({"version": MANIFEST_VERSION, "entries": hashes}, f, sort_keys=True)
+    os.replace(tmp_path, manifest_path)
 
-def _write_binary_files(base_dir: Path, entries: dict[str, bytes]) -> None:
-    for rel_path, payload in entries.items():
-        output_path = base_dir / rel_path
-        output_path.parent.mkdir(parents=True, exist_ok=True)
-        with open(output_path, "wb") as f:
-            f.write(payload)
 
+def _remove_stale_file(output_pack_dir: Path, rel_path: str) -> None:
+    stale_path = output_pack_dir / rel_path
+    stale_path.unlink(missing_ok=True)
+    parent = stale_path.parent
+    while parent != output_pack_dir:
+        try:
+            parent.rmdir()
+        except OSError:
+            break
+        parent = parent.parent
 
-def write_virtual_pack(virtual_pack: VirtualPack, output_root: str = "outputs") -> None:
-    output_pack_dir = Path(output_root) / virtual_pack["name"]
-    if output_pack_dir.exists():
-        shutil.rmtree(output_pack_dir)
+
+def write_pack_entries(
+    output_pack_dir: Path,
+    entries: dict[str, PackPayload],
+    clean: bool = False,
+    workers: int = DEFAULT_IO_WORKERS,
+    link: bool = False,
+    known: dict[str, PackPayload] | None = None,
+) -> PackWriteStats:
+    # known holds the entries last written here; payloads that are the same objects are
+    # trusted to match the manifest without hashing them again.
+    previous = None if clean else load_manifest(output_pack_dir)
+    if previous is None:
+        if output_pack_dir.exists():
+            shutil.rmtree(output_pack_dir)
+        previous = {}
     output_pack_dir.mkdir(parents=True, exist_ok=True)
 
-    with open(output_pack_dir / "pack.mcmeta", "w", encoding="utf-8") as f:
-        json.dump(virtual_pack["pack_mcmeta"], f, ensure_ascii=False, indent=4)
+    stats = PackWriteStats()
+    hashes: dict[str, str] = {}
+    pending: dict[Path, PackPayload] = {}
+    for rel_path, payload in entries.items():
+        if known is not None and known.get(rel_path) is payload and rel_path in previous:
+            hashes[rel_path] = previous[rel_path]
+            stats.unchanged += 1
+            continue
+        digest = payload_digest(payload)
+        hashes[rel_path] = digest
+        if previous.get(rel_path) == digest:
+            stats.unchanged += 1
+            continue
+        pending[output_pack_dir / rel_path] = payload
+    write_files(pending, workers, link)
+    stats.written = len(pending)
+    stats.bytes_written = sum(payload_size(payload) for payload in pending.values())
+
+    for rel_path in previous.keys() - hashes.keys():
+        _remove_stale_file(output_pack_dir, rel_path)
+        stats.removed += 1
+
+    save_manifest(output_pack_dir, hashes)
+    return stats
+
+
+def pack_output_path(output_root: str, pack_name: str, options: BuildOptions) -> Path:
+    if options.output_format == "archive":
+        return Path(output_root) / f"{pack_name}.zip"
+    return Path(output_root) / pack_name
+
+
+def write_pack_output(
+    output_root: str,
+    pack_name: str,
+    entries: dict[str, PackPayload],
+    options: BuildOptions = DEFAULT_BUILD_OPTIONS,
+    known: dict[str, PackPayload] | None = None,
+) -> Path:
+    output_path = pack_output_path(output_root, pack_name, options)
+    if options.output_format == "archive":
+        write_pack_archive(output_path, entries, workers=options.compression_workers)
+        count_io(files=1, bytes_written=output_path.stat().st_size)
+    else:
+        stats = write_pack_entries(
+            output_path,
+            entries,
+            clean=options.clean,
+            workers=options.io_workers,
+            link=options.link_textures,
+            known=known,
+        )
+        count_io(files=stats.written, bytes_written=stats.bytes_written)
+        log(
+            "done",
+            f"{output_path}: {stats.written} written, "
+            f"{stats.unchanged} unchanged, {stats.removed} removed.",
+        )
+    return output_path
+
+
+def prepare_pack_entries(
+    virtual_pack: VirtualPack,
+    options: BuildOptions = DEFAULT_BUILD_OPTIONS,
+    extra_entries: dict[str, PackPayload] | None = None,
+    previous: SerializedPack | None = None,
+) -> dict[str, PackPayload]:
+    if options.texture_optimization != "off":
+        from accurate_clock_crafter.core.texture_optimization import optimize_pack_textures
+
+        with trace_span("optimize_textures"):
+            virtual_pack, texture_stats = optimize_pack_textures(
+                virtual_pack,
+                quantize=options.texture_optimization == "palette",
+                workers=options.io_workers,
+            )
+        log(
+            "textures",
+            f"{virtual_pack['name']}: {texture_stats.deduplicated} deduplicated, "
+            f"{texture_stats.bytes_before} -> {texture_stats.bytes_after} bytes",
+        )
+    with trace_span("serialize_pack"):
+        entries = serialize_virtual_pack(virtual_pack, options.json_profile, previous)
+    if extra_entries:
+        entries.update(extra_entries)
+    if options.report_json_savings:
+        report_json_savings(
+            virtual_pack["name"],
+            [
+                virtual_pack["pack_mcmeta"],
+                *virtual_pack["items"].values(),
+                *virtual_pack["models"].values(),
+            ],
+            options.json_profile,
+        )
+    return entries
+
+
+def save_pack_entries(
+    output_root: str,
+    pack_name: str,
+    entries: dict[str, PackPayload],
+    options: BuildOptions = DEFAULT_BUILD_OPTIONS,
+    known: dict[str, PackPayload] | None = None,
+) -> None:
+    with trace_span("write_output"):
+        output_path = write_pack_output(output_root, pack_name, entries, options, known)
+    log(None, f"Resource pack saved to {output_path.resolve()}")
 
-    _write_json_files(output_pack_dir / "assets/minecraft/items", virtual_pack["items"])
-    _write_json_files(output_pack_dir / "assets/minecraft/models", virtual_pack["models"])
-    _write_binary_files(output_pack_dir / "assets/minecraft/textures", virtual_pack["textures"])
 
-    print(f"Resource pack saved to {output_pack_dir.resolve()}")
+def write_virtual_pack(
+    virtual_pack: VirtualPack,
+    output_root: str = "outputs",
+    options: BuildOptions = DEFAULT_BUILD_OPTIONS,
+    extra_entries: dict[str, PackPayload] | None = None,
+) -> None:
+    with trace_span("write_pack", template=virtual_pack["name"]):
+        entries = prepare_pack_entries(virtual_pack, options, extra_entries)
+        save_pack_entries(output_root, virtual_pack["name"], entries, options)
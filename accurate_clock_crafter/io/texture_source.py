@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import hashlib
+import mmap
+import os
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Iterator
+
+from accurate_clock_crafter.utils.tracing import pool_task
+
+COPY_CHUNK_SIZE = 1 << 20
+
+
+def content_hash(payload: bytes) -> str:
+    return hashlib.blake2b(payload, digest_size=16).hexdigest()
+
+
+@dataclass(frozen=True, slots=True)
+class TextureSource:
+    path: Path
+    size: int
+    digest: str
+
+    @classmethod
+    def from_path(cls, path: Path) -> TextureSource:
+        path = Path(path).resolve()
+        with _mapped_file(path) as view:
+            return cls(path=path, size=len(view), digest=content_hash(view))
+
+    def read_bytes(self) -> bytes:
+        return self.path.read_bytes()
+
+
+PackPayload = bytes | TextureSource
+
+
+@contextmanager
+def _mapped_file(path: Path) -> Iterator[bytes | mmap.mmap]:
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            # mmap refuses empty files.
+            yield b""
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as view:
+            yield view
+
+
+@contextmanager
+def mapped_payload(payload: PackPayload) -> Iterator[bytes | mmap.mmap]:
+    if isinstance(payload, TextureSource):
+        with _mapped_file(payload.path) as view:
+            yield view
+    else:
+        yield payload
+
+
+def payload_digest(payload: PackPayload) -> str:
+    if isinstance(payload, TextureSource):
+        return payload.digest
+    return content_hash(payload)
+
+
+def payload_size(payload: PackPayload) -> int:
+    if isinstance(payload, TextureSource):
+        return payload.size
+    return len(payload)
+
+
+def texture_sources(paths: list[Path], workers: int) -> list[TextureSource]:
+    if len(paths) <= 1 or workers <= 1:
+        return [TextureSource.from_path(path) for path in paths]
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(pool_task(TextureSource.from_path), paths))
+
+
+def _zero_copy_calls(source_fd: int, destination_fd: int) -> list[Callable[[int, int], int]]:
+    calls: list[Callable[[int, int], int]] = []
+    if hasattr(os, "copy_file_range"):
+        calls.append(
+            lambda count, offset: os.copy_file_range(
+                source_fd, destination_fd, count, offset, offset
+            )
+        )
+    if hasattr(os, "sendfile"):
+        # sendfile writes at the destination's file position, which stays at 0 until it runs.
+        calls.append(lambda count, offset: os.sendfile(destination_fd, source_fd, offset, count))
+    return calls
+
+
+def _copy_fd(source_fd: int, destination_fd: int, size: int) -> int:
+    for copy_call in _zero_copy_calls(source_fd, destination_fd):
+        copied = 0
+        try:
+            while copied < size:
+                sent = copy_call(size - copied, copied)
+                if sent == 0:
+                    break
+                copied += sent
+        except OSError:
+            if copied:
+                raise
+        # Some filesystems copy nothing without raising; the next method gets a try then.
+        if copied:
+            return copied
+    with (
+        open(source_fd, "rb", closefd=False) as src,
+        open(destination_fd, "wb", closefd=False) as dst,
+    ):
+        shutil.copyfileobj(src, dst, COPY_CHUNK_SIZE)
+        return dst.tell()
+
+
+def copy_texture(source: TextureSource, destination: Path, link: bool = False) -> None:
+    if link:
+        try:
+            os.link(source.path, destination)
+            return
+        except OSError:
+            pass
+    with open(source.path, "rb") as src, open(destination, "wb") as dst:
+        copied = _copy_fd(src.fileno(), dst.fileno(), source.size)
+    if copied != source.size:
+        raise OSError(
+            f"Texture {source.path} changed while copying: expected {source.size} bytes, "
+            f"copied {copied}"
+        )
@@ -1,23 +1,50 @@
 from __future__ import annotations
 
-import copy
+import argparse
+import dataclasses
 import json
-import shutil
-from dataclasses import dataclass
+import os
+import sys
+from dataclasses import dataclass, field
+from functools import lru_cache
 from pathlib import Path
-from typing import Callable
+from typing import Any
 
-from accurate_clock_crafter.builders.analog_clock_builder import build_analog_pack
-from accurate_clock_crafter.builders.digital_clock_builder import build_digital_pack
+from accurate_clock_crafter.builders.registry import BUILDER_REGISTRY
+from accurate_clock_crafter.core.build_options import (
+    DEFAULT_BUILD_OPTIONS,
+    DEFAULT_CACHE_DIR,
+    BuildOptions,
+)
+from accurate_clock_crafter.core.model_dispatch import VirtualPack, create_virtual_pack
 from accurate_clock_crafter.core.pack_metadata import (
     RESOURCE_COMPAT_1_21_6_AND_ABOVE,
     build_pack_meta,
 )
+from accurate_clock_crafter.core.task_graph import TaskGraph
+from accurate_clock_crafter.core.time_resolution import MINUTES_PER_HALF_DAY
+from accurate_clock_crafter.io.batch_io import DEFAULT_IO_WORKERS
+from accurate_clock_crafter.io.json_encoding import JSON_PROFILES, JsonProfile
+from accurate_clock_crafter.io.pack_writer import (
+    MODELS_PREFIX,
+    SerializedPack,
+    prepare_pack_entries,
+    save_pack_entries,
+    serialize_virtual_pack,
+)
+from accurate_clock_crafter.io.texture_source import (
+    PackPayload,
+    TextureSource,
+    content_hash,
+    payload_digest,
+)
+from accurate_clock_crafter.utils.tracing import TRACER, log, trace_span
 
 BASE_INPUT_DIR = Path("inputs_templates")
 BASE_OUTPUT_DIR = Path("outputs")
 ACCURATE_PACK_NAME = "AccurateClocks"
 ROOT_ICON_PATH = Path("icon.png")
+CLOCK_ITEM_NAME = "clock.json"
 
 
 def _build_vanilla_clock_entries() -> list[dict]:
@@ -55,22 +82,28 @@ def _build_vanilla_clock_range_dispatch(source: str) -> dict:
     }
 
 
-DEFAULT_CLOCK_MODEL_PAYLOAD = {
-    "type": "minecraft:select",
-    "property": "minecraft:context_dimension",
-    "cases": [
-        {
-            "when": "minecraft:overworld",
-            "model": _build_vanilla_clock_range_dispatch("daytime"),
-        }
-    ],
-    "fallback": _build_vanilla_clock_range_dispatch("random"),
-}
+@lru_cache(maxsize=1)
+def default_clock_model_payload() -> dict:
+    return {
+        "type": "minecraft:select",
+        "property": "minecraft:context_dimension",
+        "cases": [
+            {
+                "when": "minecraft:overworld",
+                "model": _build_vanilla_clock_range_dispatch("daytime"),
+            }
+        ],
+        "fallback": _build_vanilla_clock_range_dispatch("random"),
+    }
+
+
+def __getattr__(name: str) -> Any:
+    if name == "DEFAULT_CLOCK_MODEL_PAYLOAD":
+        return default_clock_model_payload()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-META_TYPE_TO_BUILDER: dict[str, Callable[[str], None]] = {
-    "analog": build_analog_pack,
-    "digital": build_digital_pack,
-}
+
+META_TYPE_TO_BUILDER = BUILDER_REGISTRY
 
 
 @dataclass(slots=True)
@@ -83,19 +116,29 @@ class TemplatePack:
     def display_name(self) -> str:
         return self.name.replace("_", " ")
 
-    @property
-    def output_dir(self) -> Path:
-        return BASE_OUTPUT_DIR / self.name
+
+@dataclass(frozen=True, slots=True)
+class AssetConflict:
+    path: str
+    kept_from: str
+    overwritten_by: str
+
+
+@dataclass(slots=True)
+class MergeReport:
+    conflicts: list[AssetConflict] = field(default_factory=list)
+    deduplicated: int = 0
 
 
 @dataclass(slots=True)
 class VariantCase:
     template: TemplatePack
     model_payload: dict
+    virtual_pack: VirtualPack
 
 
 def discover_templates() -> list[TemplatePack]:
-    print("[build] Discovering templates...")
+    log("build", "Discovering templates...")
     templates: list[TemplatePack] = []
     if not BASE_INPUT_DIR.exists():
         raise FileNotFoundError(f"Missing {BASE_INPUT_DIR}")
@@ -105,14 +148,14 @@ def discover_templates() -> list[TemplatePack]:
             continue
         pack_mcmeta = entry / "pack.mcmeta"
         if not pack_mcmeta.exists():
-            print(f"[skip] {entry.name}: pack.mcmeta not found")
+            log("skip", f"{entry.name}: pack.mcmeta not found")
             continue
         with open(pack_mcmeta, "r", encoding="utf-8") as f:
             meta = json.load(f)
 
         meta_type = meta.get("meta_type")
         if not meta_type:
-            print(f"[skip] {entry.name}: meta_type missing in pack.mcmeta")
+            log("skip", f"{entry.name}: meta_type missing in pack.mcmeta")
             continue
 
         templates.append(
@@ -126,76 +169,66 @@ def discover_templates() -> list[TemplatePack]:
     return templates
 
 
-def build_templates(templates: list[TemplatePack]) -> list[TemplatePack]:
-    print("[build] Building template packs...")
-    successful: list[TemplatePack] = []
-    for template in templates:
-        builder = META_TYPE_TO_BUILDER.get(template.meta_type)
-        if builder is None:
-            print(
-                f"[skip] {template.name}: no builder registered for meta_type='{template.meta_type}'"
-            )
-            continue
-
-        print(f"[build] {template.name} ({template.meta_type})")
-        try:
-            builder(template.name)
-        except Exception as exc:  # pragma: no cover
-            print(f"[error] {template.name}: {exc}")
-            continue
-
-        successful.append(template)
+def _build_template(template: TemplatePack, options: BuildOptions) -> VirtualPack:
+    with trace_span("build_template", template=template.name):
+        log("build", f"{template.name} ({template.meta_type})")
+        builder = META_TYPE_TO_BUILDER[template.meta_type]
+        return builder(template.name, options)
 
-    return successful
 
-
-def load_variant_cases(templates: list[TemplatePack]) -> list[VariantCase]:
-    print("[build] Loading built variant cases...")
-    cases: list[VariantCase] = []
+def buildable_templates(templates: list[TemplatePack]) -> list[TemplatePack]:
+    buildable: list[TemplatePack] = []
     for template in templates:
-        clock_path = template.output_dir / "assets/minecraft/items/clock.json"
-        if not clock_path.exists():
-            print(f"[warn] {template.name}: missing clock.json, skipping from aggregate")
+        if template.meta_type not in META_TYPE_TO_BUILDER:
+            log(
+                "skip",
+                f"{template.name}: no builder registered for meta_type='{template.meta_type}'",
+            )
             continue
-        with open(clock_path, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        buildable.append(template)
+    return buildable
 
-        model_payload = data.get("model")
-        if model_payload is None:
-            print(f"[warn] {template.name}: clock.json missing 'model', skipping")
-            continue
 
-        cases.append(VariantCase(template=template, model_payload=copy.deepcopy(model_payload)))
+def variant_case(template: TemplatePack, virtual_pack: VirtualPack) -> VariantCase | None:
+    data = virtual_pack["items"].get(CLOCK_ITEM_NAME)
+    if data is None:
+        log("warn", f"{template.name}: missing clock.json, skipping from aggregate")
+        return None
 
-    return cases
+    model_payload = data.get("model")
+    if model_payload is None:
+        log("warn", f"{template.name}: clock.json missing 'model', skipping")
+        return None
+
+    return VariantCase(
+        template=template,
+        model_payload=model_payload,
+        virtual_pack=virtual_pack,
+    )
 
 
-def write_pack_mcmeta(destination: Path) -> None:
+def build_pack_mcmeta() -> dict:
     description = "§7Accurate §6Clocks§r\n§8JE 1.21.6+§r by GrakePCH"
-    pack_data = {
+    return {
         "pack": build_pack_meta(description, RESOURCE_COMPAT_1_21_6_AND_ABOVE),
     }
-    destination.parent.mkdir(parents=True, exist_ok=True)
-    with open(destination, "w", encoding="utf-8") as f:
-        json.dump(pack_data, f, ensure_ascii=False, indent=4)
 
 
-def copy_pack_icon(destination: Path) -> None:
+def read_pack_icon() -> TextureSource:
     if not ROOT_ICON_PATH.exists():
         raise FileNotFoundError(f"Missing {ROOT_ICON_PATH}")
-    destination.parent.mkdir(parents=True, exist_ok=True)
-    shutil.copy2(ROOT_ICON_PATH, destination)
+    return TextureSource.from_path(ROOT_ICON_PATH)
 
 
 def build_combined_clock_json(cases: list[VariantCase]) -> dict:
     if not cases:
         raise ValueError("No variant cases available to build combined clock.json")
 
-    fallback_model = copy.deepcopy(DEFAULT_CLOCK_MODEL_PAYLOAD)
+    # Payloads are shared with the variant packs rather than copied; they are only serialized.
     select_cases = [
         {
             "when": case.template.display_name,
-            "model": copy.deepcopy(case.model_payload),
+            "model": case.model_payload,
         }
         for case in cases
     ]
@@ -205,75 +238,575 @@ def build_combined_clock_json(cases: list[VariantCase]) -> dict:
             "property": "minecraft:component",
             "component": "minecraft:custom_name",
             "cases": select_cases,
-            "fallback": fallback_model,
+            "fallback": default_clock_model_payload(),
         }
     }
 
 
-def write_combined_clock(destination: Path, cases: list[VariantCase]) -> None:
-    combined = build_combined_clock_json(cases)
-    destination.parent.mkdir(parents=True, exist_ok=True)
-    with open(destination, "w", encoding="utf-8") as f:
-        json.dump(combined, f, ensure_ascii=False, indent=4)
+def asset_digest(payload: dict | PackPayload) -> str:
+    if not isinstance(payload, dict):
+        return payload_digest(payload)
+    canonical = json.dumps(payload, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    return content_hash(canonical.encode("utf-8"))
+
+
+class VariantMerger:
+    # Variants are added one at a time, in discovery order, so merging can start as soon as
+    # each one is built; the result matches merging them all at once.
+    def __init__(self, destination: VirtualPack) -> None:
+        self.destination = destination
+        self.report = MergeReport()
+        self.origins: dict[str, dict[str, str]] = {"models": {}, "textures": {}}
+        self._digests: dict[str, dict[str, str]] = {"models": {}, "textures": {}}
+
+    def add(self, case: VariantCase) -> None:
+        for section in ("models", "textures"):
+            merged = self.destination[section]
+            origins = self.origins[section]
+            digests = self._digests[section]
+            for rel_path, payload in case.virtual_pack[section].items():
+                origin = origins.get(rel_path)
+                if origin is None:
+                    origins[rel_path] = case.template.name
+                    merged[rel_path] = payload
+                    continue
+
+                # Digests are only needed once two variants claim the same path.
+                if rel_path not in digests:
+                    digests[rel_path] = asset_digest(merged[rel_path])
+                digest = asset_digest(payload)
+                if digest == digests[rel_path]:
+                    self.report.deduplicated += 1
+                    continue
+
+                self.report.conflicts.append(
+                    AssetConflict(
+                        path=f"minecraft/{section}/{rel_path}",
+                        kept_from=origin,
+                        overwritten_by=case.template.name,
+                    )
+                )
+                origins[rel_path] = case.template.name
+                digests[rel_path] = digest
+                merged[rel_path] = payload
+
+
+def _finish_composite(
+    composite: VirtualPack,
+    cases: list[VariantCase],
+    merge_report: MergeReport,
+    options: BuildOptions,
+) -> VirtualPack:
+    for conflict in merge_report.conflicts:
+        log(
+            "conflict",
+            f"{conflict.path}: {conflict.kept_from} overwritten by "
+            f"{conflict.overwritten_by}",
+        )
+    if merge_report.conflicts and options.strict_merge:
+        raise ValueError(
+            f"{len(merge_report.conflicts)} conflicting assets while merging "
+            f"{ACCURATE_PACK_NAME}; rerun without --strict to let later variants win"
+        )
+    if merge_report.deduplicated:
+        log("merge", f"{merge_report.deduplicated} identical shared assets deduplicated.")
+    with trace_span("build_combined_clock_json"):
+        composite["items"][CLOCK_ITEM_NAME] = build_combined_clock_json(cases)
+    if options.verify_dispatch:
+        with trace_span("verify_dispatch"):
+            _verify_composite_dispatch(composite)
+    return composite
+
+
+def _verify_composite_dispatch(composite: VirtualPack) -> None:
+    from accurate_clock_crafter.dispatch_check import enforce_item_dispatch
+
+    models = {rel_path.removesuffix(".json") for rel_path in composite["models"]}
+    enforce_item_dispatch(ACCURATE_PACK_NAME, composite["items"][CLOCK_ITEM_NAME], models)
+
+
+def check_composite_cost(
+    options: BuildOptions, entries: dict[str, PackPayload] | None
+) -> dict[str, PackPayload] | None:
+    if entries is None:
+        return None
+    from accurate_clock_crafter.pack_cost import (
+        analyze_entries,
+        enforce_pack_budget,
+        load_budget,
+        report_pack_cost,
+    )
+
+    # The serialized entries are exactly what gets written, so an over-budget pack is
+    # rejected before it reaches the output directory.
+    with trace_span("analyze_pack_cost"):
+        cost = analyze_entries(ACCURATE_PACK_NAME, entries)
+        report_pack_cost(cost)
+        if options.budget_path is not None:
+            enforce_pack_budget(cost, load_budget(options.budget_path))
+    return entries
+
 
+GeneratedVariant = tuple[VirtualPack, dict[str, PackPayload] | None]
 
-def merge_variant_assets(destination_assets: Path, templates: list[TemplatePack]) -> None:
-    for template in templates:
-        src_assets = template.output_dir / "assets"
-        if not src_assets.exists():
-            print(f"[warn] {template.name}: assets folder missing, skipping asset merge")
-            continue
 
-        for file in src_assets.rglob("*"):
-            if not file.is_file():
-                continue
-            rel_path = file.relative_to(src_assets)
-            if rel_path.as_posix() == "minecraft/items/clock.json":
+def _encode_variant(
+    virtual_pack: VirtualPack, options: BuildOptions, previous: SerializedPack | None = None
+) -> GeneratedVariant:
+    # Encoding in the worker that already holds the pack; the composite reuses these
+    # bytes for the models it merges, unless texture optimization rewrites them.
+    if options.write_variant_packs:
+        with trace_span("encode_pack"):
+            return virtual_pack, prepare_pack_entries(virtual_pack, options, previous=previous)
+    if options.texture_optimization == "off":
+        with trace_span("serialize_pack"):
+            entries = serialize_virtual_pack(virtual_pack, options.json_profile, previous)
+        return virtual_pack, entries
+    return virtual_pack, None
+
+
+def generate_variant(
+    template: TemplatePack, options: BuildOptions, previous: SerializedPack | None = None
+) -> GeneratedVariant | None:
+    # A failing template is logged and left out; the other variants still build.
+    with trace_span("generate_variant", template=template.name):
+        try:
+            virtual_pack = _build_template(
+                template, dataclasses.replace(options, write_variant_packs=False)
+            )
+            return _encode_variant(virtual_pack, options, previous)
+        except Exception as exc:  # pragma: no cover
+            log("error", f"{template.name}: {exc}")
+            return None
+
+
+def _write_variant(
+    template: TemplatePack, options: BuildOptions, generated: GeneratedVariant | None
+) -> bool:
+    if generated is None:
+        return False
+    if generated[1] is None or not options.write_variant_packs:
+        return True
+    with trace_span("write_pack", template=template.name):
+        try:
+            save_pack_entries(str(BASE_OUTPUT_DIR), template.name, generated[1], options)
+        except Exception as exc:  # pragma: no cover
+            log("error", f"{template.name}: {exc}")
+            return False
+    return True
+
+
+@dataclass(slots=True)
+class CompositeBuild:
+    options: BuildOptions
+    composite: VirtualPack = field(default_factory=lambda: create_virtual_pack(ACCURATE_PACK_NAME))
+    cases: list[VariantCase] = field(default_factory=list)
+    variant_entries: dict[str, dict[str, PackPayload]] = field(default_factory=dict)
+    merger: VariantMerger = field(init=False)
+
+    def __post_init__(self) -> None:
+        self.composite["pack_mcmeta"] = build_pack_mcmeta()
+        self.merger = VariantMerger(self.composite)
+
+    def add(
+        self, template: TemplatePack, generated: GeneratedVariant | None, written: bool
+    ) -> None:
+        if generated is None or not written:
+            return
+        virtual_pack, entries = generated
+        case = variant_case(template, virtual_pack)
+        if case is None:
+            return
+        with trace_span("merge_variant_assets", template=template.name):
+            self.merger.add(case)
+        self.cases.append(case)
+        if entries is not None:
+            self.variant_entries[template.name] = entries
+
+    def finish(self) -> VirtualPack | None:
+        log("build", "Assembling AccurateClocks composite pack...")
+        if not self.cases:
+            log("warn", "No variants available for AccurateClocks; nothing to assemble.")
+            return None
+        with trace_span("finish_composite"):
+            return _finish_composite(self.composite, self.cases, self.merger.report, self.options)
+
+    def variant_serialization(self) -> SerializedPack | None:
+        # Each merged model is the very payload its variant encoded, so those bytes are reused.
+        if self.options.texture_optimization != "off":
+            return None
+        models: dict[str, dict] = {}
+        entries: dict[str, PackPayload] = {}
+        for rel_path, origin in self.merger.origins["models"].items():
+            variant_entries = self.variant_entries.get(origin)
+            if variant_entries is None:
                 continue
+            models[rel_path] = self.composite["models"][rel_path]
+            entries[f"{MODELS_PREFIX}{rel_path}"] = variant_entries[f"{MODELS_PREFIX}{rel_path}"]
+        reused = create_virtual_pack(ACCURATE_PACK_NAME)
+        reused["models"] = models
+        return SerializedPack(reused, entries, self.options.json_profile)
+
+    def serialize(self, composite: VirtualPack | None) -> dict[str, PackPayload] | None:
+        if composite is None:
+            return None
+        with trace_span("encode_pack", template=ACCURATE_PACK_NAME):
+            return prepare_pack_entries(
+                composite,
+                self.options,
+                extra_entries={"pack.png": read_pack_icon()},
+                previous=self.variant_serialization(),
+            )
 
-            dest_file = destination_assets / rel_path
-            dest_file.parent.mkdir(parents=True, exist_ok=True)
-            if dest_file.exists():
-                print(f"[overwrite] {rel_path.as_posix()} <- {template.name}")
-            shutil.copy2(file, dest_file)
 
+def _write_composite(options: BuildOptions, entries: dict[str, PackPayload] | None) -> None:
+    if entries is None:
+        return
+    with trace_span("write_pack", template=ACCURATE_PACK_NAME):
+        save_pack_entries(str(BASE_OUTPUT_DIR), ACCURATE_PACK_NAME, entries, options)
 
-def _assemble_composite_pack(templates: list[TemplatePack]) -> None:
-    print("[build] Assembling AccurateClocks composite pack...")
-    target_dir = BASE_OUTPUT_DIR / ACCURATE_PACK_NAME
-    if target_dir.exists():
-        shutil.rmtree(target_dir)
-    target_dir.mkdir(parents=True, exist_ok=True)
 
-    cases = load_variant_cases(templates)
-    if not cases:
-        print("[warn] No variants available for AccurateClocks; nothing to assemble.")
+def _report_composite(composite: VirtualPack | None) -> None:
+    if composite is None:
         return
+    variant_count = len(composite["items"][CLOCK_ITEM_NAME]["model"]["cases"])
+    log("done", f"AccurateClocks generated with {variant_count} variants.")
 
-    write_pack_mcmeta(target_dir / "pack.mcmeta")
-    copy_pack_icon(target_dir / "pack.png")
-    merge_variant_assets(target_dir / "assets", [case.template for case in cases])
-    write_combined_clock(target_dir / "assets/minecraft/items/clock.json", cases)
-    print(f"[done] AccurateClocks generated with {len(cases)} variants.")
+
+def build_pipeline(templates: list[TemplatePack], options: BuildOptions) -> TaskGraph:
+    # Variants build on processes and write on threads; each is merged as soon as it and
+    # the variants before it are done, so the composite keeps discovery order.
+    graph = TaskGraph()
+    composite = CompositeBuild(options)
+    previous_merge: tuple[str, ...] = ()
+    for template in templates:
+        generate = graph.add(
+            f"generate:{template.name}", generate_variant, template, options, kind="cpu"
+        )
+        write = graph.add(
+            f"write:{template.name}",
+            _write_variant,
+            template,
+            options,
+            after=(generate,),
+            kind="io",
+        )
+        # A variant whose own pack failed to write is left out of the composite too.
+        previous_merge = (
+            graph.add(
+                f"merge:{template.name}",
+                composite.add,
+                template,
+                after=(generate, write),
+                ordered_after=previous_merge,
+            ),
+        )
+
+    finish = graph.add(
+        f"finish:{ACCURATE_PACK_NAME}", composite.finish, ordered_after=previous_merge
+    )
+    serialize = graph.add(
+        f"serialize:{ACCURATE_PACK_NAME}", composite.serialize, after=(finish,)
+    )
+    if options.report_cost or options.budget_path is not None:
+        serialize = graph.add(
+            f"analyze_cost:{ACCURATE_PACK_NAME}",
+            check_composite_cost,
+            options,
+            after=(serialize,),
+        )
+    write = graph.add(
+        f"write:{ACCURATE_PACK_NAME}", _write_composite, options, after=(serialize,), kind="io"
+    )
+    graph.add(
+        f"report:{ACCURATE_PACK_NAME}",
+        _report_composite,
+        after=(finish,),
+        ordered_after=(write,),
+    )
+    if options.audit_time_curve:
+        graph.add("audit_time_curve", _audit_time_curve)
+    return graph
 
 
-def build_composite_pack() -> None:
-    templates = discover_templates()
+def _build_composite_pack(options: BuildOptions) -> None:
+    with trace_span("discover_templates"):
+        templates = discover_templates()
     if not templates:
-        print("[warn] No templates found in inputs_templates.")
+        log("warn", "No templates found in inputs_templates.")
         return
 
-    built_templates = build_templates(templates)
-    if not built_templates:
-        print("[warn] No templates built successfully.")
+    log("build", "Building template packs...")
+    buildable = buildable_templates(templates)
+    if not buildable:
+        log("warn", "No templates built successfully.")
         return
 
-    _assemble_composite_pack(built_templates)
+    graph = build_pipeline(buildable, options)
+    with trace_span("run_pipeline"):
+        pipeline_run = graph.run(
+            cpu_workers=min(options.jobs, len(buildable)), io_workers=options.io_workers
+        )
+    path, critical = graph.critical_path(pipeline_run.durations)
+    log(
+        "schedule",
+        f"{len(graph.tasks)} tasks in {pipeline_run.wall:.2f}s; "
+        f"{sum(pipeline_run.durations.values()):.2f}s of task time, critical path "
+        f"{critical:.2f}s through {' -> '.join(path)}",
+    )
+
+
+def _audit_time_curve() -> None:
+    from accurate_clock_crafter.core.time_accuracy import audit_time_curve
+    from accurate_clock_crafter.time_audit import report_accuracy
+
+    with trace_span("audit_time_curve"):
+        report_accuracy(audit_time_curve())
+
+
+def export_trace(options: BuildOptions) -> None:
+    if options.trace_json is not None:
+        TRACER.write_json(options.trace_json)
+        log("trace", f"Build trace saved to {options.trace_json}")
+    if options.chrome_trace is not None:
+        TRACER.write_chrome_trace(options.chrome_trace)
+        log("trace", f"Chrome trace saved to {options.chrome_trace}")
+
+
+def build_composite_pack(options: BuildOptions = DEFAULT_BUILD_OPTIONS) -> None:
+    TRACER.reset(options.trace_memory)
+    try:
+        with trace_span("build"):
+            _build_composite_pack(options)
+    finally:
+        export_trace(options)
+
+
+def _resolve_json_profile(args: argparse.Namespace) -> JsonProfile:
+    profile = dataclasses.replace(JSON_PROFILES[args.json_profile], backend=args.json_backend)
+    if args.float_precision is not None:
+        profile = dataclasses.replace(profile, float_precision=args.float_precision)
+    return profile
+
+
+def parse_build_options(argv: list[str] | None = None) -> BuildOptions:
+    parser = argparse.ArgumentParser(description="Build the Accurate Clocks resource packs.")
+    parser.add_argument(
+        "--archive",
+        action="store_true",
+        help="write each pack as a deterministic .zip instead of a directory tree",
+    )
+    parser.add_argument(
+        "--compression-workers",
+        type=int,
+        default=None,
+        help="threads used to deflate archive entries (default: Python's thread pool default)",
+    )
+    parser.add_argument(
+        "--io-workers",
+        type=int,
+        default=DEFAULT_IO_WORKERS,
+        help="threads used for batched template reads and pack writes",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        default=DEFAULT_CACHE_DIR,
+        help="directory holding cached template builds (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="always regenerate every template instead of reusing cached builds",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="templates built in parallel on a process pool (0 = one per CPU core)",
+    )
+    parser.add_argument(
+        "--analog-layout",
+        choices=["full", "layered"],
+        default="full",
+        help="'full' emits one model per displayed minute; 'layered' emits a static face plus "
+        "hour- and minute-hand models stacked with minecraft:composite",
+    )
+    parser.add_argument(
+        "--digital-layout",
+        choices=["full", "layered"],
+        default="full",
+        help="'full' emits one model per displayed minute; 'layered' emits one model per digit "
+        "slot value stacked with minecraft:composite",
+    )
+    parser.add_argument(
+        "--hour-hand-positions",
+        type=int,
+        default=60,
+        help="hour-hand models per 12 hours in the layered analog layout (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--no-variant-packs",
+        action="store_true",
+        help="only write the AccurateClocks composite, not a standalone pack per template",
+    )
+    parser.add_argument(
+        "--strict",
+        action="store_true",
+        help="fail the build when two variants write different content to the same asset path",
+    )
+    parser.add_argument(
+        "--clean",
+        action="store_true",
+        help="ignore output manifests and rewrite every pack directory from scratch",
+    )
+    parser.add_argument(
+        "--optimize-textures",
+        nargs="?",
+        const="lossless",
+        default="off",
+        choices=["off", "lossless", "palette"],
+        help="deduplicate pixel-identical textures and re-encode PNGs at maximum compression; "
+        "'palette' also stores images with at most 256 colors as indexed PNGs when lossless",
+    )
+    parser.add_argument(
+        "--link-textures",
+        action="store_true",
+        help="hard-link unchanged template textures into directory outputs instead of copying "
+        "them (falls back to copying across filesystems)",
+    )
+    parser.add_argument(
+        "--report-cost",
+        action="store_true",
+        help="print models, range entries, JSON/PNG bytes and textures per variant of the "
+        "composite",
+    )
+    parser.add_argument(
+        "--budget",
+        metavar="PATH",
+        help="fail the build when the composite exceeds the per-variant or total limits in this "
+        "JSON file",
+    )
+    parser.add_argument(
+        "--verify-dispatch",
+        action="store_true",
+        help="resolve every daytime tick of each variant in the composite clock.json before "
+        "writing it and fail on unresolved or missing models",
+    )
+    parser.add_argument(
+        "--audit-time",
+        action="store_true",
+        help="report how far the displayed minute drifts from the in-game time across the day",
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="build once, then rebuild only the templates whose files change and patch their "
+        "files in outputs",
+    )
+    parser.add_argument(
+        "--watch-interval",
+        type=float,
+        default=0.5,
+        help="seconds between scans of inputs_templates in --watch mode",
+    )
+    parser.add_argument(
+        "--trace-json",
+        metavar="PATH",
+        help="write per-stage and per-template timings, file counts and bytes written as JSON",
+    )
+    parser.add_argument(
+        "--chrome-trace",
+        metavar="PATH",
+        help="write the build trace in Chrome trace-event format (chrome://tracing, Perfetto)",
+    )
+    parser.add_argument(
+        "--trace-memory",
+        action="store_true",
+        help="record the tracemalloc peak of stages on the main thread (slows the build down)",
+    )
+    parser.add_argument(
+        "--json-profile",
+        choices=sorted(JSON_PROFILES),
+        default="pretty",
+        help="JSON output profile: 'pretty' (indent=4) or 'compact' (minified, rounded floats)",
+    )
+    parser.add_argument(
+        "--float-precision",
+        type=int,
+        default=None,
+        help="decimal places kept for thresholds and rotation angles (overrides the profile)",
+    )
+    parser.add_argument(
+        "--json-backend",
+        choices=["auto", "json", "orjson"],
+        default="auto",
+        help="JSON encoder; 'auto' uses orjson for unindented output when it is installed",
+    )
+    parser.add_argument(
+        "--report-json-savings",
+        action="store_true",
+        help="print the bytes saved by the JSON profile compared to 'pretty'",
+    )
+    args = parser.parse_args(argv)
+    if args.watch and (args.archive or args.optimize_textures != "off"):
+        parser.error(
+            "--watch patches directory output and cannot be combined with --archive or "
+            "--optimize-textures"
+        )
+    if not 1 <= args.hour_hand_positions <= MINUTES_PER_HALF_DAY:
+        parser.error(
+            f"--hour-hand-positions must be between 1 and {MINUTES_PER_HALF_DAY}, "
+            f"got {args.hour_hand_positions}"
+        )
+    if args.json_backend == "orjson" and JSON_PROFILES[args.json_profile].indent is not None:
+        parser.error(
+            f"--json-backend orjson cannot produce the indented '{args.json_profile}' "
+            "profile; use --json-profile compact or another backend"
+        )
+    return BuildOptions(
+        output_format="archive" if args.archive else "directory",
+        compression_workers=args.compression_workers,
+        io_workers=args.io_workers,
+        clean=args.clean,
+        strict_merge=args.strict,
+        jobs=args.jobs if args.jobs > 0 else os.cpu_count() or 1,
+        write_variant_packs=not args.no_variant_packs,
+        cache_dir=None if args.no_cache else args.cache_dir,
+        analog_layout=args.analog_layout,
+        digital_layout=args.digital_layout,
+        hour_hand_positions=args.hour_hand_positions,
+        texture_optimization=args.optimize_textures,
+        link_textures=args.link_textures,
+        trace_json=args.trace_json,
+        chrome_trace=args.chrome_trace,
+        trace_memory=args.trace_memory,
+        report_cost=args.report_cost,
+        budget_path=args.budget,
+        verify_dispatch=args.verify_dispatch,
+        audit_time_curve=args.audit_time,
+        watch=args.watch,
+        watch_interval=args.watch_interval,
+        json_profile=_resolve_json_profile(args),
+        report_json_savings=args.report_json_savings,
+    )
+
 
+def run(argv: list[str] | None = None) -> int:
+    options = parse_build_options(argv)
+    if options.watch:
+        from accurate_clock_crafter.watch import watch_templates
 
-def run() -> None:
-    build_composite_pack()
+        watch_templates(options)
+        return 0
+    # Merge conflicts under --strict, failed dispatch checks and budget violations end the
+    # build with a logged error instead of a traceback.
+    try:
+        build_composite_pack(options)
+    except ValueError as exc:
+        log("error", str(exc))
+        return 1
+    return 0
 
 
 if __name__ == "__main__":
-    run()
+    sys.exit(run())
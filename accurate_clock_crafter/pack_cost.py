@@ -0,0 +1,275 @@
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import zipfile
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Iterator
+
+from accurate_clock_crafter.core.model_dispatch import VirtualPack
+from accurate_clock_crafter.io.json_encoding import PRETTY_JSON_PROFILE, JsonProfile
+from accurate_clock_crafter.io.pack_writer import (
+    ITEMS_PREFIX,
+    MODELS_PREFIX,
+    TEXTURES_PREFIX,
+    serialize_virtual_pack,
+)
+from accurate_clock_crafter.io.texture_source import PackPayload, payload_digest, payload_size
+from accurate_clock_crafter.utils.tracing import log
+
+CLOCK_ITEM_PATH = f"{ITEMS_PREFIX}clock.json"
+CLOCK_MODEL_PREFIX = "item/clock/"
+SHARED_VARIANT = "(shared)"
+FILE_CLASS_PREFIXES = {"items": ITEMS_PREFIX, "models": MODELS_PREFIX, "textures": TEXTURES_PREFIX}
+VARIANT_METRICS = (
+    "models",
+    "range_entries",
+    "json_bytes",
+    "png_bytes",
+    "textures",
+    "distinct_textures",
+)
+TOTAL_METRICS = ("files", "bytes", *VARIANT_METRICS)
+
+
+@dataclass(slots=True)
+class FileClassCost:
+    files: int = 0
+    bytes: int = 0
+
+
+@dataclass(slots=True)
+class VariantCost:
+    models: int = 0
+    range_entries: int = 0
+    json_bytes: int = 0
+    png_bytes: int = 0
+    textures: int = 0
+    # Textures whose content no earlier variant already ships.
+    distinct_textures: int = 0
+
+
+@dataclass(slots=True)
+class PackCost:
+    name: str
+    file_classes: dict[str, FileClassCost] = field(default_factory=dict)
+    variants: dict[str, VariantCost] = field(default_factory=dict)
+
+    def totals(self) -> dict[str, int]:
+        totals = {
+            "files": sum(cost.files for cost in self.file_classes.values()),
+            "bytes": sum(cost.bytes for cost in self.file_classes.values()),
+        }
+        for metric in VARIANT_METRICS:
+            totals[metric] = sum(getattr(cost, metric) for cost in self.variants.values())
+        return totals
+
+    def to_json(self) -> dict:
+        return {
+            "name": self.name,
+            "totals": self.totals(),
+            "file_classes": {name: asdict(cost) for name, cost in self.file_classes.items()},
+            "variants": {name: asdict(cost) for name, cost in self.variants.items()},
+        }
+
+
+@dataclass(frozen=True, slots=True)
+class PackBudget:
+    variant: dict[str, int] = field(default_factory=dict)
+    total: dict[str, int] = field(default_factory=dict)
+
+
+def _file_class(rel_path: str) -> str:
+    for name, prefix in FILE_CLASS_PREFIXES.items():
+        if rel_path.startswith(prefix):
+            return name
+    return "other"
+
+
+def _variant_key(resource_path: str) -> str:
+    resource_path = resource_path.removeprefix("minecraft:")
+    if not resource_path.startswith(CLOCK_MODEL_PREFIX):
+        return SHARED_VARIANT
+    parts = resource_path[len(CLOCK_MODEL_PREFIX) :].split("/")
+    return parts[0] if len(parts) > 1 else SHARED_VARIANT
+
+
+def _iter_model_refs(node: Any) -> Iterator[str]:
+    if isinstance(node, dict):
+        if node.get("type") == "minecraft:model" and isinstance(node.get("model"), str):
+            yield node["model"]
+        for value in node.values():
+            yield from _iter_model_refs(value)
+    elif isinstance(node, list):
+        for value in node:
+            yield from _iter_model_refs(value)
+
+
+def _count_range_entries(node: Any) -> int:
+    if isinstance(node, dict):
+        own = len(node.get("entries", ())) if node.get("type") == "minecraft:range_dispatch" else 0
+        return own + sum(_count_range_entries(value) for value in node.values())
+    if isinstance(node, list):
+        return sum(_count_range_entries(value) for value in node)
+    return 0
+
+
+def _owner(node: Any) -> str:
+    return next((_variant_key(ref) for ref in _iter_model_refs(node)), SHARED_VARIANT)
+
+
+def _item_model_parts(clock_item: dict) -> list[Any]:
+    # The composite selects variants by custom name; each case is charged to its own variant.
+    model = clock_item.get("model", {})
+    if model.get("type") == "minecraft:select" and model.get("property") == "minecraft:component":
+        return [case.get("model") for case in model.get("cases", [])] + [model.get("fallback")]
+    return [model]
+
+
+def analyze_entries(name: str, entries: dict[str, PackPayload]) -> PackCost:
+    cost = PackCost(name=name)
+    seen_textures: set[str] = set()
+
+    def variant(key: str) -> VariantCost:
+        return cost.variants.setdefault(key, VariantCost())
+
+    for rel_path in sorted(entries):
+        payload = entries[rel_path]
+        size = payload_size(payload)
+        file_class = cost.file_classes.setdefault(_file_class(rel_path), FileClassCost())
+        file_class.files += 1
+        file_class.bytes += size
+        if rel_path.startswith(MODELS_PREFIX):
+            owner = variant(_variant_key(rel_path[len(MODELS_PREFIX) :]))
+            owner.models += 1
+            owner.json_bytes += size
+        elif rel_path.startswith(TEXTURES_PREFIX) and rel_path.endswith(".png"):
+            owner = variant(_variant_key(rel_path[len(TEXTURES_PREFIX) :]))
+            owner.textures += 1
+            owner.png_bytes += size
+            digest = payload_digest(payload)
+            if digest not in seen_textures:
+                seen_textures.add(digest)
+                owner.distinct_textures += 1
+
+    clock_payload = entries.get(CLOCK_ITEM_PATH)
+    if clock_payload is not None:
+        clock_item = json.loads(
+            clock_payload if isinstance(clock_payload, bytes) else clock_payload.read_bytes()
+        )
+        parts = _item_model_parts(clock_item)
+        for part in parts:
+            variant(_owner(part)).range_entries += _count_range_entries(part)
+        clock_owner = _owner(parts[0]) if len(parts) == 1 else SHARED_VARIANT
+        variant(clock_owner).json_bytes += payload_size(clock_payload)
+    return cost
+
+
+def analyze_virtual_pack(
+    virtual_pack: VirtualPack, profile: JsonProfile = PRETTY_JSON_PROFILE
+) -> PackCost:
+    return analyze_entries(virtual_pack["name"], serialize_virtual_pack(virtual_pack, profile))
+
+
+def load_pack_entries(path: Path) -> dict[str, bytes]:
+    if path.is_dir():
+        return {
+            file.relative_to(path).as_posix(): file.read_bytes()
+            for file in path.rglob("*")
+            if file.is_file()
+        }
+    if zipfile.is_zipfile(path):
+        with zipfile.ZipFile(path) as archive:
+            return {
+                info.filename: archive.read(info)
+                for info in archive.infolist()
+                if not info.is_dir()
+            }
+    raise FileNotFoundError(f"Not a pack directory or zip archive: {path}")
+
+
+def analyze_pack_path(path: Path) -> PackCost:
+    return analyze_entries(path.name.removesuffix(".zip"), load_pack_entries(path))
+
+
+def load_budget(path: str | Path) -> PackBudget:
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    for section, metrics in (("variant", VARIANT_METRICS), ("total", TOTAL_METRICS)):
+        unknown = set(data.get(section, {})) - set(metrics)
+        if unknown:
+            raise ValueError(
+                f"Unknown {section} budget metric(s) in {path}: {', '.join(sorted(unknown))}; "
+                f"expected any of {', '.join(metrics)}"
+            )
+    return PackBudget(variant=dict(data.get("variant", {})), total=dict(data.get("total", {})))
+
+
+def check_budget(cost: PackCost, budget: PackBudget) -> list[str]:
+    violations: list[str] = []
+    for key, variant_cost in cost.variants.items():
+        if key == SHARED_VARIANT:
+            continue
+        for metric, limit in budget.variant.items():
+            value = getattr(variant_cost, metric)
+            if value > limit:
+                violations.append(f"{key}: {metric} {value} exceeds budget {limit}")
+    totals = cost.totals()
+    for metric, limit in budget.total.items():
+        if totals[metric] > limit:
+            violations.append(
+                f"{cost.name}: total {metric} {totals[metric]} exceeds budget {limit}"
+            )
+    return violations
+
+
+def report_pack_cost(cost: PackCost) -> None:
+    totals = cost.totals()
+    log("cost", f"{cost.name}: {totals['files']} files, {totals['bytes']} bytes")
+    for name, file_class in sorted(cost.file_classes.items()):
+        log("cost", f"  {name:<9} {file_class.files:>6} files {file_class.bytes:>12} bytes")
+    for key, variant_cost in sorted(cost.variants.items()):
+        log(
+            "cost",
+            f"  {key}: {variant_cost.models} models, {variant_cost.range_entries} range entries, "
+            f"{variant_cost.json_bytes} JSON bytes, {variant_cost.textures} textures "
+            f"({variant_cost.distinct_textures} new, {variant_cost.png_bytes} PNG bytes)",
+        )
+
+
+def enforce_pack_budget(cost: PackCost, budget: PackBudget) -> None:
+    violations = check_budget(cost, budget)
+    for violation in violations:
+        log("budget", violation)
+    if violations:
+        raise ValueError(f"{cost.name} exceeds its pack budget in {len(violations)} place(s)")
+
+
+def run(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Report what a built pack costs per variant and check it against a budget."
+    )
+    parser.add_argument("pack", type=Path, help="built pack directory or .zip archive")
+    parser.add_argument("--budget", help="JSON file with 'variant' and/or 'total' metric limits")
+    parser.add_argument("--json", type=Path, help="also write the report as JSON to this file")
+    args = parser.parse_args(argv)
+
+    cost = analyze_pack_path(args.pack)
+    report_pack_cost(cost)
+    if args.json is not None:
+        args.json.parent.mkdir(parents=True, exist_ok=True)
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(cost.to_json(), f, indent=2)
+    if args.budget is not None:
+        try:
+            enforce_pack_budget(cost, load_budget(args.budget))
+        except ValueError as exc:
+            log("error", str(exc))
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(run())
@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import argparse
+import itertools
+import json
+import sys
+from pathlib import Path
+
+from accurate_clock_crafter.core.time_accuracy import (
+    SHIPPED_CURVE,
+    AccuracyReport,
+    CurveParameters,
+    audit_time_curve,
+)
+from accurate_clock_crafter.utils.tracing import log
+
+
+def report_accuracy(report: AccuracyReport) -> None:
+    percentiles = ", ".join(
+        f"p{percentile:g} {value:.2f}" for percentile, value in report.percentiles.items()
+    )
+    worst_hours = ", ".join(f"{hour:02d}:00 ({error:.2f})" for hour, error in report.worst_hours)
+    log(
+        "audit",
+        f"{report.parameters.label}: max {report.max_error:.2f} min, "
+        f"mean {report.mean_error:+.2f}, {percentiles}",
+    )
+    log(
+        "audit",
+        f"  {report.wrong_samples}/{report.samples} samples "
+        f"({report.wrong_samples / report.samples:.1%}) off the true minute by up to "
+        f"{report.max_drift:g}; worst hours {worst_hours}",
+    )
+
+
+def run(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Measure how far the displayed minute drifts from the in-game time."
+    )
+    parser.add_argument(
+        "--marker-minutes",
+        type=int,
+        nargs="+",
+        default=[SHIPPED_CURVE.marker_minutes],
+        help="minutes between sampled curve markers",
+    )
+    parser.add_argument(
+        "--step-minutes",
+        type=int,
+        nargs="+",
+        default=[SHIPPED_CURVE.step_minutes],
+        help="minutes between displayed times",
+    )
+    parser.add_argument(
+        "--blend",
+        type=float,
+        nargs="+",
+        default=[SHIPPED_CURVE.blend],
+        help="weight of the eased term in the assumed tick-to-angle curve",
+    )
+    parser.add_argument("--subticks", type=int, default=1, help="samples per game tick")
+    parser.add_argument(
+        "--double-precision",
+        action="store_true",
+        help="compare in double precision instead of the game's single precision",
+    )
+    parser.add_argument("--json", type=Path, help="also write the reports as JSON to this file")
+    args = parser.parse_args(argv)
+
+    try:
+        reports = [
+            audit_time_curve(
+                CurveParameters(marker_minutes, step_minutes, blend),
+                subticks=args.subticks,
+                single_precision=not args.double_precision,
+            )
+            for marker_minutes, step_minutes, blend in itertools.product(
+                args.marker_minutes, args.step_minutes, args.blend
+            )
+        ]
+    except (RuntimeError, ValueError) as exc:
+        log("error", str(exc))
+        return 1
+    for report in reports:
+        report_accuracy(report)
+    if args.json is not None:
+        args.json.parent.mkdir(parents=True, exist_ok=True)
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump([report.to_json() for report in reports], f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(run())
@@ -1,14 +1,60 @@
-from PIL import Image
+from __future__ import annotations
+
+import io
+from typing import IO, Iterable
+
+from PIL import Image, ImageChops
+
+RGB = tuple[int, int, int]
 
 
 def mask_subtract(image_1: Image.Image, image_2: Image.Image) -> Image.Image:
-    alpha_1 = list(image_1.split()[-1].getdata())
-    alpha_2 = list(image_2.split()[-1].getdata())
+    return ImageChops.subtract(image_1.getchannel("A"), image_2.getchannel("A"))
+
+
+def color_mask(image: Image.Image, color: RGB) -> Image.Image:
+    red, green, blue = ImageChops.difference(
+        image.convert("RGB"), Image.new("RGB", image.size, color)
+    ).split()
+    # A pixel matches only when every channel difference is zero; add() saturates at 255.
+    distance = ImageChops.add(ImageChops.add(red, green), blue)
+    return distance.point(lambda value: 255 if value == 0 else 0)
+
+
+def colors_mask(image: Image.Image, colors: Iterable[RGB]) -> Image.Image:
+    mask = Image.new("L", image.size, 0)
+    for color in colors:
+        mask = ImageChops.lighter(mask, color_mask(image, color))
+    return mask
+
+
+def remap_colors(image: Image.Image, mapping: dict[RGB, RGB]) -> Image.Image:
+    image = image.convert("RGBA")
+    alpha = image.getchannel("A")
+    # Masks are taken from the source image so swaps such as a<->b do not chain.
+    masks = [(target, color_mask(image, source)) for source, target in mapping.items()]
+    result = image.convert("RGB")
+    for target, mask in masks:
+        result.paste(target, mask=mask)
+    result.putalpha(alpha)
+    return result
+
+
+def emissive_layer(image: Image.Image, colors: Iterable[RGB]) -> Image.Image:
+    image = image.convert("RGBA")
+    alpha = ImageChops.multiply(image.getchannel("A"), colors_mask(image, colors))
+    result = Image.new("RGBA", image.size, (0, 0, 0, 0))
+    result.paste(image, mask=alpha.point(lambda value: 255 if value else 0))
+    return result
+
+
+def decode_png(payload: bytes | IO[bytes]) -> Image.Image:
+    stream = io.BytesIO(payload) if isinstance(payload, bytes) else payload
+    with Image.open(stream) as image:
+        return image.convert("RGBA")
 
-    result_alpha = []
-    for pixel_1, pixel_2 in zip(alpha_1, alpha_2):
-        result_alpha.append(max(pixel_1 - pixel_2, 0))
 
-    result_mask = Image.new("L", image_1.size)
-    result_mask.putdata(result_alpha)
-    return result_mask
+def encode_png(image: Image.Image) -> bytes:
+    buffer = io.BytesIO()
+    image.save(buffer, format="PNG")
+    return buffer.getvalue()
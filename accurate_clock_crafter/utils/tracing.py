@@ -0,0 +1,297 @@
+from __future__ import annotations
+
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Iterator, TypeVar
+
+TRACE_FORMAT_VERSION = 1
+
+T = TypeVar("T")
+
+
+@dataclass(slots=True)
+class TraceSpan:
+    name: str
+    template: str | None
+    start: float
+    pid: int
+    tid: int
+    depth: int
+    wall: float = 0.0
+    cpu: float = 0.0
+    files: int = 0
+    bytes_written: int = 0
+    peak_memory: int | None = None
+    _cpu_start: float = field(default=0.0, repr=False)
+    # CPU spent for this span on pool threads and worker processes, added by pool_task.
+    _pool_cpu: float = field(default=0.0, repr=False)
+    _memory_start: int = field(default=0, repr=False)
+    _memory_peak: int = field(default=0, repr=False)
+    _template_root: bool = field(default=False, repr=False)
+
+
+@dataclass(frozen=True, slots=True)
+class TraceEvent:
+    tag: str | None
+    message: str
+    time: float
+    template: str | None
+    pid: int
+    tid: int
+
+
+TraceListener = Callable[[TraceEvent], None]
+
+
+# print() writes the text and the newline separately, so lines logged from pool threads
+# could run together; each line is written in one call under this lock instead.
+_PRINT_LOCK = threading.Lock()
+
+
+def print_event(event: TraceEvent) -> None:
+    line = f"[{event.tag}] {event.message}" if event.tag else event.message
+    with _PRINT_LOCK:
+        sys.stdout.write(f"{line}\n")
+
+
+def _public_fields(span: TraceSpan) -> dict:
+    return {key: value for key, value in asdict(span).items() if not key.startswith("_")}
+
+
+class Tracer:
+    def __init__(self) -> None:
+        self.spans: list[TraceSpan] = []
+        self.events: list[TraceEvent] = []
+        self.listeners: list[TraceListener] = [print_event]
+        self.trace_memory = False
+        self._epoch = time.perf_counter()
+        self._local = threading.local()
+        self._pool_cpu_lock = threading.Lock()
+
+    def _stack(self) -> list[TraceSpan]:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def reset(self, trace_memory: bool = False) -> None:
+        self.spans.clear()
+        self.events.clear()
+        self._local = threading.local()
+        self.trace_memory = trace_memory
+        if trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    def current_template(self) -> str | None:
+        for span in reversed(self._stack()):
+            if span.template is not None:
+                return span.template
+        return None
+
+    @contextmanager
+    def span(self, name: str, template: str | None = None) -> Iterator[TraceSpan]:
+        stack = self._stack()
+        parent = stack[-1] if stack else None
+        span = TraceSpan(
+            name=name,
+            template=template if template is not None else self.current_template(),
+            start=time.perf_counter(),
+            pid=os.getpid(),
+            tid=threading.get_ident(),
+            depth=len(stack),
+            # Process CPU would include whatever other threads run meanwhile, so a span counts
+            # its own thread plus the pool work it hands out through pool_task.
+            _cpu_start=time.thread_time(),
+        )
+        span._template_root = span.template is not None and (
+            parent is None or parent.template != span.template
+        )
+        # The tracemalloc peak is process-wide, so only main-thread spans reset and read it;
+        # spans on pool threads would reset each other's peaks. Their peak_memory stays None.
+        tracing_memory = (
+            self.trace_memory
+            and tracemalloc.is_tracing()
+            and threading.current_thread() is threading.main_thread()
+        )
+        if tracing_memory:
+            current, peak = tracemalloc.get_traced_memory()
+            # The peak counter is shared, so the parent keeps what it saw before it is reset.
+            if parent is not None:
+                parent._memory_peak = max(parent._memory_peak, peak)
+            tracemalloc.reset_peak()
+            span._memory_start = span._memory_peak = current
+        stack.append(span)
+        try:
+            yield span
+        finally:
+            stack.pop()
+            span.wall = time.perf_counter() - span.start
+            span.cpu = time.thread_time() - span._cpu_start + span._pool_cpu
+            if tracing_memory:
+                span._memory_peak = max(span._memory_peak, tracemalloc.get_traced_memory()[1])
+                span.peak_memory = span._memory_peak - span._memory_start
+                if parent is not None:
+                    parent._memory_peak = max(parent._memory_peak, span._memory_peak)
+            if parent is not None:
+                parent.files += span.files
+                parent.bytes_written += span.bytes_written
+                parent._pool_cpu += span._pool_cpu
+            self.spans.append(span)
+
+    def _add_pool_cpu(self, span: TraceSpan, seconds: float) -> None:
+        with self._pool_cpu_lock:
+            span._pool_cpu += seconds
+
+    def pool_task(self, function: Callable[..., T]) -> Callable[..., T]:
+        # Wraps work handed to a thread pool so its CPU is added to the submitting span.
+        stack = self._stack()
+        if not stack:
+            return function
+        span = stack[-1]
+
+        def run(*args: Any) -> T:
+            start = time.thread_time()
+            try:
+                return function(*args)
+            finally:
+                self._add_pool_cpu(span, time.thread_time() - start)
+
+        return run
+
+    def count_io(self, files: int = 0, bytes_written: int = 0) -> None:
+        stack = self._stack()
+        if stack:
+            stack[-1].files += files
+            stack[-1].bytes_written += bytes_written
+
+    def log(self, tag: str | None, message: str) -> None:
+        event = TraceEvent(
+            tag=tag,
+            message=message,
+            time=time.perf_counter(),
+            template=self.current_template(),
+            pid=os.getpid(),
+            tid=threading.get_ident(),
+        )
+        self.events.append(event)
+        for listener in self.listeners:
+            listener(event)
+
+    def records(self) -> tuple[list[TraceSpan], list[TraceEvent]]:
+        return list(self.spans), list(self.events)
+
+    def merge(self, records: tuple[list[TraceSpan], list[TraceEvent]]) -> None:
+        # Records from worker processes were already printed there; they are only stored here.
+        spans, events = records
+        stack = self._stack()
+        depth = len(stack)
+        for span in spans:
+            span.depth += depth
+            if stack and span.depth == depth:
+                stack[-1].files += span.files
+                stack[-1].bytes_written += span.bytes_written
+                self._add_pool_cpu(stack[-1], span.cpu)
+        self.spans.extend(spans)
+        self.events.extend(events)
+
+    def _relative(self, timestamp: float) -> float:
+        return timestamp - self._epoch
+
+    def to_json(self) -> dict:
+        spans = sorted(self.spans, key=lambda span: span.start)
+        by_stage: dict[str, dict] = {}
+        by_template: dict[str, dict] = {}
+        for span in spans:
+            _add_to_summary(by_stage, span.name, span)
+            # Per-template totals use the outermost span only, so nested stages are not re-added.
+            if span._template_root:
+                _add_to_summary(by_template, span.template, span)
+        return {
+            "format": TRACE_FORMAT_VERSION,
+            "spans": [
+                {**_public_fields(span), "start": self._relative(span.start)} for span in spans
+            ],
+            "events": [
+                {**asdict(event), "time": self._relative(event.time)} for event in self.events
+            ],
+            "stages": by_stage,
+            "templates": by_template,
+        }
+
+    def to_chrome_trace(self) -> dict:
+        trace_events: list[dict] = []
+        for span in sorted(self.spans, key=lambda span: span.start):
+            args = {
+                "cpu_ms": span.cpu * 1000,
+                "files": span.files,
+                "bytes_written": span.bytes_written,
+            }
+            if span.template is not None:
+                args["template"] = span.template
+            if span.peak_memory is not None:
+                args["peak_memory"] = span.peak_memory
+            trace_events.append(
+                {
+                    "name": span.name,
+                    "cat": "stage",
+                    "ph": "X",
+                    "ts": self._relative(span.start) * 1e6,
+                    "dur": span.wall * 1e6,
+                    "pid": span.pid,
+                    "tid": span.tid,
+                    "args": args,
+                }
+            )
+        for event in self.events:
+            trace_events.append(
+                {
+                    "name": event.tag or "log",
+                    "cat": "log",
+                    "ph": "i",
+                    "s": "t",
+                    "ts": self._relative(event.time) * 1e6,
+                    "pid": event.pid,
+                    "tid": event.tid,
+                    "args": {"message": event.message},
+                }
+            )
+        return {"traceEvents": trace_events, "displayTimeUnit": "ms"}
+
+    def write_json(self, path: str | Path) -> None:
+        _dump_json(Path(path), self.to_json())
+
+    def write_chrome_trace(self, path: str | Path) -> None:
+        _dump_json(Path(path), self.to_chrome_trace())
+
+
+def _add_to_summary(summary: dict[str, dict], key: str, span: TraceSpan) -> None:
+    entry = summary.setdefault(
+        key, {"count": 0, "wall": 0.0, "cpu": 0.0, "files": 0, "bytes_written": 0}
+    )
+    entry["count"] += 1
+    entry["wall"] += span.wall
+    entry["cpu"] += span.cpu
+    entry["files"] += span.files
+    entry["bytes_written"] += span.bytes_written
+    if span.peak_memory is not None:
+        entry["peak_memory"] = max(entry.get("peak_memory", 0), span.peak_memory)
+
+
+def _dump_json(path: Path, payload: dict) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(payload, f, indent=2)
+
+
+TRACER = Tracer()
+trace_span = TRACER.span
+count_io = TRACER.count_io
+pool_task = TRACER.pool_task
+log = TRACER.log
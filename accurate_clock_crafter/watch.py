@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+import dataclasses
+import os
+import time
+from pathlib import Path
+
+from accurate_clock_crafter.core.build_options import BuildOptions
+from accurate_clock_crafter.io.pack_writer import SerializedPack, save_pack_entries
+from accurate_clock_crafter.io.texture_source import PackPayload
+from accurate_clock_crafter.main import (
+    ACCURATE_PACK_NAME,
+    BASE_INPUT_DIR,
+    BASE_OUTPUT_DIR,
+    CompositeBuild,
+    GeneratedVariant,
+    buildable_templates,
+    check_composite_cost,
+    discover_templates,
+    export_trace,
+    generate_variant,
+)
+from accurate_clock_crafter.utils.tracing import TRACER, log, trace_span
+
+# Editors often save in several steps, so a change is only built once a rescan sees no more.
+WATCH_SETTLE_SECONDS = 0.1
+
+TemplateSnapshot = dict[str, tuple[int, int]]
+
+
+def snapshot_template(template_dir: Path) -> TemplateSnapshot:
+    snapshot: TemplateSnapshot = {}
+    for root, _, files in os.walk(template_dir):
+        for name in files:
+            path = os.path.join(root, name)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            snapshot[os.path.relpath(path, template_dir)] = (stat.st_mtime_ns, stat.st_size)
+    return snapshot
+
+
+def snapshot_templates() -> dict[str, TemplateSnapshot]:
+    if not BASE_INPUT_DIR.exists():
+        raise FileNotFoundError(f"Missing {BASE_INPUT_DIR}")
+    return {
+        entry.name: snapshot_template(entry)
+        for entry in sorted(BASE_INPUT_DIR.iterdir())
+        if entry.is_dir()
+    }
+
+
+class WatchSession:
+    def __init__(self, options: BuildOptions) -> None:
+        self.options = options
+        # The session keeps every built pack in memory, so the on-disk cache is skipped.
+        self.build_options = dataclasses.replace(options, cache_dir=None)
+        self.write_options = options
+        self.snapshots: dict[str, TemplateSnapshot] = {}
+        self.generated: dict[str, GeneratedVariant] = {}
+        self.composite_entries: dict[str, PackPayload] | None = None
+
+    def changed_templates(self) -> set[str]:
+        snapshots = snapshot_templates()
+        changed = {
+            name
+            for name in snapshots.keys() | self.snapshots.keys()
+            if snapshots.get(name) != self.snapshots.get(name)
+        }
+        self.snapshots = snapshots
+        return changed
+
+    def wait_for_changes(self, interval: float) -> set[str]:
+        changed: set[str] = set()
+        while not changed:
+            time.sleep(interval)
+            changed = self.changed_templates()
+        while True:
+            time.sleep(WATCH_SETTLE_SECONDS)
+            more = self.changed_templates()
+            if not more:
+                return changed
+            changed |= more
+
+    def _previous(self, name: str) -> SerializedPack | None:
+        generated = self.generated.get(name)
+        if generated is None or generated[1] is None:
+            return None
+        return SerializedPack(generated[0], generated[1], self.options.json_profile)
+
+    def rebuild(self, names: set[str]) -> None:
+        templates = {
+            template.name: template
+            for template in buildable_templates(discover_templates())
+        }
+        for name in sorted(names - templates.keys()):
+            if self.generated.pop(name, None) is not None:
+                log("watch", f"{name}: template removed from the composite")
+
+        # Serialized files of an unchanged model are reused and not rewritten.
+        for name in [name for name in templates if name in names]:
+            previous = self.generated.get(name)
+            generated = generate_variant(templates[name], self.build_options, self._previous(name))
+            # A template that fails to build keeps its previous output until it builds again.
+            if generated is None:
+                continue
+            self.generated[name] = generated
+            if self.options.write_variant_packs:
+                with trace_span("write_pack", template=name):
+                    save_pack_entries(
+                        str(BASE_OUTPUT_DIR),
+                        name,
+                        generated[1],
+                        self.write_options,
+                        known=previous[1] if previous is not None else None,
+                    )
+
+        build = CompositeBuild(self.options)
+        for name in templates:
+            if name in self.generated:
+                build.add(templates[name], self.generated[name], written=True)
+        composite = build.finish()
+        entries = build.serialize(composite)
+        if self.options.report_cost or self.options.budget_path is not None:
+            entries = check_composite_cost(self.options, entries)
+        if entries is None:
+            return
+        with trace_span("write_pack", template=ACCURATE_PACK_NAME):
+            save_pack_entries(
+                str(BASE_OUTPUT_DIR),
+                ACCURATE_PACK_NAME,
+                entries,
+                self.write_options,
+                known=self.composite_entries,
+            )
+        self.composite_entries = entries
+        self.write_options = dataclasses.replace(self.options, clean=False)
+
+    def run_cycle(self, names: set[str]) -> None:
+        TRACER.reset(self.options.trace_memory)
+        start = time.perf_counter()
+        try:
+            with trace_span("build"):
+                self.rebuild(names)
+        except Exception as exc:  # pragma: no cover
+            # The session keeps watching so the next save can fix what broke this one.
+            log("error", f"Rebuild of {', '.join(sorted(names))} failed: {exc}")
+            return
+        finally:
+            export_trace(self.options)
+        log(
+            "watch",
+            f"Rebuilt {', '.join(sorted(names))} in {time.perf_counter() - start:.2f}s.",
+        )
+
+
+def watch_templates(options: BuildOptions) -> None:
+    session = WatchSession(options)
+    session.changed_templates()
+    session.run_cycle(set(session.snapshots))
+    log("watch", f"Watching {BASE_INPUT_DIR} for changes; press Ctrl+C to stop.")
+    try:
+        while True:
+            session.run_cycle(session.wait_for_changes(options.watch_interval))
+    except KeyboardInterrupt:
+        log("watch", "Stopped.")
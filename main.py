@@ -1,5 +1,7 @@
+import sys
+
 from accurate_clock_crafter.main import run
 
 
 if __name__ == "__main__":
-    run()
+    sys.exit(run())